@@ -5,15 +5,23 @@ Web-based editor for content files with auto-rebuild
 """
 
 import os
+import sys
 import asyncio
+import hashlib
+import threading
+import time
 import json
+import shutil
 import subprocess
+import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional
-from datetime import date
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache
 
 from fastapi import FastAPI, Request, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import yaml
@@ -23,18 +31,122 @@ from watchdog.events import FileSystemEventHandler
 
 # Configuration
 CONTENT_DIR = Path("/app/content")
+# Personalised copy of CONTENT_DIR that mkdocs builds from (docs_dir)
+WORK_DIR = Path("/app/content-work")
 SITE_DIR = Path("/app/site")
 OUTPUT_DIR = Path("/app/output")
 TEMPLATES_DIR = Path(__file__).parent / "templates"
+SCRIPTS_DIR = Path("/app/scripts")
+
+# Markdown renderer for the live preview (installed with mkdocs-material)
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+# Generic secrets scanner, imported once so its patterns are compiled once
+sys.path.insert(0, str(SCRIPTS_DIR))
+try:
+    import scan_generic_secrets
+except ImportError:
+    scan_generic_secrets = None
+
+# Front matter parsing shared with the PDF exporter
+import content_model
+
+try:
+    import personalise
+except ImportError:
+    personalise = None
 
 app = FastAPI(title="Hit By A Bus Plan Editor", version="1.0.0")
 
 # Setup templates
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
-# Global state for rebuild management
-rebuild_in_progress = False
-rebuild_queue = asyncio.Queue()
+# Rebuild debounce bounds (seconds); the delay adapts to recent build times
+REBUILD_DEBOUNCE_MIN = 0.2
+REBUILD_DEBOUNCE_MAX = 2.0
+# Cancel a running build when a newer edit arrives (a --clean build that is
+# cut short leaves the site incomplete until the follow-up build finishes)
+CANCEL_SUPERSEDED_BUILDS = os.environ.get('EDITOR_CANCEL_SUPERSEDED_BUILDS', 'false').lower() == 'true'
+
+# Global state for security scans
+scans_in_progress = 0  # Scans can overlap (warm-up, rebuilds, manual)
+last_scan_passed: Optional[bool] = None
+
+# Comment line sent to idle event streams so proxies keep them open
+SSE_KEEPALIVE = 30
+
+
+class EventBroadcaster:
+    """Fans server-sent events out to every open editor tab"""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.closed = False
+
+    def publish(self, event: str, data: dict):
+        """Queue an event for every subscriber (call on the event loop)"""
+        message = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                pass  # Slow client: it catches up with the next status event
+
+    def publish_threadsafe(self, event: str, data: dict):
+        """publish() from another thread, e.g. the content watcher"""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.publish, event, data)
+
+    def close(self):
+        """End every stream so the server can shut down (safe in a signal handler)"""
+        self.closed = True
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._end_streams)
+
+    def _end_streams(self):
+        for queue in list(self.subscribers):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    async def stream(self, first: dict):
+        """Event stream for one client, starting with a status snapshot"""
+        if self.closed:
+            return
+        queue = asyncio.Queue(maxsize=256)
+        self.subscribers.add(queue)
+        try:
+            yield f"event: status\ndata: {json.dumps(first)}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    message = ": keepalive\n\n"
+                if message is None:
+                    return  # Shutting down
+                yield message
+        finally:
+            self.subscribers.discard(queue)
+
+
+events = EventBroadcaster()
+
+# uvicorn waits for open responses to finish before it runs shutdown
+# handlers, so an open event stream would hold up every stop and reload.
+# End the streams as soon as the server is asked to exit.
+_uvicorn_handle_exit = uvicorn.Server.handle_exit
+
+
+def _handle_exit(server, sig, frame):
+    events.close()
+    _uvicorn_handle_exit(server, sig, frame)
+
+
+uvicorn.Server.handle_exit = _handle_exit
 
 
 class ContentFile:
@@ -50,228 +162,842 @@ class ContentFile:
     def _load_content(self):
         """Load and parse the markdown file"""
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Split front matter and content
-            if content.startswith('---\n'):
-                parts = content.split('---\n', 2)
-                if len(parts) >= 3:
-                    self.front_matter = yaml.safe_load(parts[1]) or {}
-                    self.body = parts[2].strip()
-                else:
-                    self.front_matter = {}
-                    self.body = content
-            else:
-                self.front_matter = {}
-                self.body = content
-
+            self.section = content_model.load(self.filepath)
         except Exception as e:
             print(f"Error loading {self.filepath}: {e}")
-            self.front_matter = {}
-            self.body = ""
+            self.section = content_model.Section({}, "")
+
+    @property
+    def front_matter(self) -> dict:
+        return self.section.front_matter
 
-    def save(self, title: str, summary: str, critical: bool, body: str):
-        """Save updated content back to file"""
-        # Update front matter
-        self.front_matter.update({
+    @property
+    def body(self) -> str:
+        return self.section.body
+
+    # One lock per file keeps concurrent saves of a section in order
+    _save_locks: Dict[Path, asyncio.Lock] = {}
+
+    async def save(self, title: str, summary: str, critical: bool, body: str):
+        """Save updated content back to file
+
+        Serialising and writing run in a worker thread so the event loop keeps
+        serving other requests. The new content is written to a temporary file
+        and renamed over the original, so mkdocs and the scanners never see a
+        partial file. The in-memory model is updated without re-reading.
+        """
+        front_matter = dict(self.front_matter)
+        front_matter.update({
             'title': title,
             'updated': date.today().strftime('%Y-%m-%d'),
             'summary': summary,
             'critical': critical
         })
-        self.body = body
 
-        # Write back to file
-        content = "---\n"
-        content += yaml.dump(self.front_matter, default_flow_style=False)
-        content += "---\n\n"
-        content += body
+        lock = ContentFile._save_locks.setdefault(self.filepath, asyncio.Lock())
+        async with lock:
+            await asyncio.to_thread(self._write, front_matter, body)
+            await asyncio.to_thread(sync_work_copy, self.filepath)
+            self.section = content_model.Section(front_matter, body)
+            content_index.update(self)
+
+        # Trigger rebuild of just this section
+        await trigger_rebuild(self.filepath)
 
-        with open(self.filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+    def _write(self, front_matter: dict, body: str):
+        """Serialise and atomically replace the file (blocking)"""
+        content = content_model.dump(front_matter, body)
 
-        # Trigger rebuild
-        asyncio.create_task(trigger_rebuild())
+        # Hidden temp name in the same directory: the index skips it and the
+        # rename cannot cross filesystems
+        fd, tmp = tempfile.mkstemp(dir=self.filepath.parent, prefix=f".{self.filename}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.chmod(tmp, self.filepath.stat().st_mode & 0o7777)
+            except OSError:
+                pass  # Keep mkstemp's private mode if the original is gone
+            os.replace(tmp, self.filepath)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
 
     @property
     def title(self) -> str:
-        return self.front_matter.get('title', self.section_name)
+        title = self.section.title
+        return self.section_name if title is None else title
 
     @property
     def summary(self) -> str:
-        return self.front_matter.get('summary', '')
+        return self.section.summary
 
     @property
     def critical(self) -> bool:
-        return self.front_matter.get('critical', False)
+        return self.section.critical
 
     @property
     def updated(self) -> str:
-        return self.front_matter.get('updated', '')
+        return self.section.updated
+
+
+class DetectSecretsScanner:
+    """detect-secrets limited to the content directories, with per-file results
+
+    Results are kept per file with its size and mtime (and persisted between
+    runs), so each scan only hands detect-secrets the files that changed.
+    Scans are serialised: one that waited finds the files already up to date.
+    """
+
+    # Files per detect-secrets invocation, well below argument length limits
+    BATCH = 200
+
+    def __init__(self, directories: List[Path], cache_path: Path):
+        self.directories = directories
+        self.cache_path = cache_path
+        self.version: Optional[str] = None
+        self.entries: Optional[Dict[str, dict]] = None
+        self.lock = asyncio.Lock()
+
+    def files(self) -> Dict[str, tuple]:
+        """(directory, size, mtime_ns) of every non-hidden file under the directories"""
+        found = {}
+        for directory in self.directories:
+            for path in directory.rglob('*'):
+                if path.name.startswith('.') or not path.is_file():
+                    continue
+                st = path.stat()
+                found[str(path)] = (directory, st.st_size, st.st_mtime_ns)
+        return found
+
+    def load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.entries = data['files'] if data.get('version') == self.version else {}
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.entries = {}  # Missing or unreadable cache: scan everything
+
+    def save(self, entries: Dict[str, dict]):
+        # Same format rules as the generic scanner cache: private, atomic
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_path.parent, prefix=f".{self.cache_path.name}.")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'files': entries}, f)
+        os.replace(tmp, self.cache_path)
+
+    async def run(self, directory: Path, paths: List[str]) -> Dict[str, list]:
+        """detect-secrets results for files under directory, keyed by absolute path"""
+        # detect-secrets ignores files outside its working directory, so run
+        # it from the content directory with relative names
+        names = [os.path.relpath(path, directory) for path in paths]
+        results = {}
+        for i in range(0, len(names), self.BATCH):
+            # --all-files: scan the named files even if git does not track them
+            process = await asyncio.create_subprocess_exec(
+                'detect-secrets', 'scan', '--all-files', *names[i:i + self.BATCH],
+                cwd=str(directory),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate()
+            if process.returncode != 0:
+                raise RuntimeError(stderr.decode(errors='replace').strip() or f"exit code {process.returncode}")
+            for filename, secrets in json.loads(stdout).get('results', {}).items():
+                results[str(directory / filename)] = [
+                    {'type': secret.get('type'), 'line_number': secret.get('line_number')}
+                    for secret in secrets
+                ]
+        return results
+
+    async def scan(self) -> Dict[str, list]:
+        """Findings by file for every file under the directories"""
+        async with self.lock:
+            return await self._scan()
+
+    async def _scan(self) -> Dict[str, list]:
+        if self.version is None:
+            process = await asyncio.create_subprocess_exec(
+                'detect-secrets', '--version',
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, _ = await process.communicate()
+            self.version = stdout.decode().strip()
+        if self.entries is None:
+            await asyncio.to_thread(self.load)
+
+        current = await asyncio.to_thread(self.files)
+        stale = [
+            path for path, (_, size, mtime_ns) in current.items()
+            if (entry := self.entries.get(path)) is None
+            or entry['size'] != size or entry['mtime_ns'] != mtime_ns
+        ]
+        for directory in self.directories:
+            paths = [path for path in stale if current[path][0] == directory]
+            if not paths:
+                continue
+            results = await self.run(directory, paths)
+            for path in paths:
+                _, size, mtime_ns = current[path]
+                self.entries[path] = {'size': size, 'mtime_ns': mtime_ns, 'findings': results.get(path, [])}
+        removed = set(self.entries) - set(current)
+        for path in removed:
+            del self.entries[path]
+        if stale or removed:
+            try:
+                # Snapshot: the thread must not see the dict change under it
+                await asyncio.to_thread(self.save, dict(self.entries))
+            except OSError as e:
+                print(f"⚠️  Could not write detect-secrets cache: {e}")
+        return {path: entry['findings'] for path, entry in self.entries.items() if entry['findings']}
+
+
+detect_secrets_scanner = DetectSecretsScanner([CONTENT_DIR], OUTPUT_DIR / ".detect-secrets-cache.json")
 
 
 class SecurityScanner:
     """Handles comprehensive security scanning using detect-secrets and generic scanner"""
 
+    @staticmethod
+    def count_generic_findings(*paths: Path) -> int:
+        """Run the in-process generic scanner (blocking - call from a worker thread)"""
+        return sum(1 for _ in scan_generic_secrets.scan_paths(*map(str, paths)))
+
     @staticmethod
     async def scan():
         """Run comprehensive security scan for secrets and financial data"""
+        global scans_in_progress, last_scan_passed
+
+        scans_in_progress += 1
+        publish_status()
+        try:
+            last_scan_passed = await SecurityScanner._scan()
+        finally:
+            scans_in_progress -= 1
+            publish_status()
+        return last_scan_passed
+
+    @staticmethod
+    async def _scan():
         print("🔍 Running comprehensive security scan...")
 
-        scan_passed = True
+        # The two scanners are independent: run them side by side
+        results = await asyncio.gather(
+            SecurityScanner._detect_secrets_stage(),
+            SecurityScanner._generic_stage()
+        )
+        scan_passed = all(results)
+
+        if scan_passed:
+            print("✅ Comprehensive security scan passed")
+        else:
+            print("🚨 SECURITY ALERT: Issues detected!")
+            print("❌ Please remove sensitive data and store only references")
+            print("💡 Example: 'Account details in 1Password vault' instead of actual numbers")
+
+        return scan_passed
 
-        # 1. detect-secrets scan
+    @staticmethod
+    async def _detect_secrets_stage() -> bool:
+        """1. detect-secrets scan (content only, changed files only)"""
         try:
-            # Check if detect-secrets is available
-            check_process = await asyncio.create_subprocess_exec(
-                'which', 'detect-secrets',
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            await check_process.communicate()
-
-            if check_process.returncode == 0:
-                # Run security scan
-                process = await asyncio.create_subprocess_exec(
-                    'detect-secrets', 'scan', '--all-files',
-                    cwd='/app',
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await process.communicate()
-                scan_result = stdout.decode()
-
-                # Check if any secrets were found
-                if '"results": {}' in scan_result:
+            if detect_secrets_available():
+                findings = await detect_secrets_scanner.scan()
+                if not findings:
                     print("✅ detect-secrets: no secrets detected")
                 else:
                     print("🚨 detect-secrets found issues!")
-                    scan_passed = False
+                    for path, secrets in sorted(findings.items()):
+                        for secret in secrets:
+                            print(f"  {path}: line {secret['line_number']} ({secret['type']})")
+                    return False
             else:
                 print("⚠️  detect-secrets not installed")
 
         except Exception as e:
             print(f"⚠️  detect-secrets error: {e}")
-            scan_passed = False
+            return False
+        return True
 
-        # 2. Generic secrets scan (credit cards, IBANs, etc)
+    @staticmethod
+    async def _generic_stage() -> bool:
+        """2. Generic secrets scan (credit cards, IBANs, etc)"""
         try:
-            scanner_path = Path('/app/scripts/scan_generic_secrets.py')
-            if scanner_path.exists():
-                process = await asyncio.create_subprocess_exec(
-                    'python3', str(scanner_path), '/app/content', '--json',
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await process.communicate()
-
-                if process.returncode == 0:
-                    result = json.loads(stdout.decode())
-                    if result:
-                        print(f"🚨 Generic scan found {len(result)} financial data items!")
-                        scan_passed = False
-                    else:
-                        print("✅ Generic scan: no financial data detected")
-                else:
-                    print(f"⚠️  Generic scan failed: {stderr.decode()}")
+            if scan_generic_secrets is not None:
+                findings = await asyncio.to_thread(SecurityScanner.count_generic_findings, CONTENT_DIR)
+                if findings:
+                    print(f"🚨 Generic scan found {findings} financial data items!")
+                    return False
+                print("✅ Generic scan: no financial data detected")
             else:
                 print("⚠️  Generic scanner not found")
 
         except Exception as e:
             print(f"⚠️  Generic scan error: {e}")
+        return True
 
-        if scan_passed:
-            print("✅ Comprehensive security scan passed")
-        else:
-            print("🚨 SECURITY ALERT: Issues detected!")
-            print("❌ Please remove sensitive data and store only references")
-            print("💡 Example: 'Account details in 1Password vault' instead of actual numbers")
 
-        return scan_passed
+class MkDocsRebuilder:
+    """Handles MkDocs rebuilds with security scanning
+
+    After a successful build, edits that only touch existing sections use
+    `mkdocs build --dirty`: only pages whose source is newer than their output
+    are re-rendered and the rest of the site (theme assets included) is left
+    in place. A dirty build writes a search index holding only the re-rendered
+    pages, so the previous entries for every other page are merged back in.
+    Navigation titles come from mkdocs.yml, so they cannot change without a
+    config change. Changes to anything under SITE_DIR (mkdocs.yml, theme
+    overrides), added or removed sections, a failed build or a manual rebuild
+    fall back to a full --clean build.
+    """
+
+    SEARCH_INDEX = OUTPUT_DIR / "site" / "search" / "search_index.json"
+    # Outcome of the last build and of the scan that ran alongside it
+    BUILD_VERDICT = OUTPUT_DIR / ".site-build.json"
+    last_verdict: Optional[dict] = None
+
+    # Fingerprint of the inputs shared by every page at the last good build
+    last_fingerprint: Optional[tuple] = None
 
+    @staticmethod
+    def fingerprint() -> tuple:
+        """Config/theme file mtimes plus the set of sections (drives navigation)"""
+        site_files = sorted(
+            (str(p.relative_to(SITE_DIR)), p.stat().st_mtime_ns)
+            for p in SITE_DIR.rglob('*') if p.is_file()
+        )
+        sections = sorted(p.name for p in CONTENT_DIR.glob('*.md'))
+        return tuple(site_files), tuple(sections)
 
-class MkDocsRebuilder:
-    """Handles MkDocs rebuilds with security scanning"""
+    @staticmethod
+    def build_args(changed: Optional[set]) -> List[str]:
+        incremental = (
+            changed is not None
+            and MkDocsRebuilder.last_fingerprint == MkDocsRebuilder.fingerprint()
+            and (OUTPUT_DIR / "site" / "index.html").exists()
+        )
+        return ['mkdocs', 'build', '--dirty'] if incremental else ['mkdocs', 'build', '--clean']
 
     @staticmethod
-    async def rebuild():
-        """Rebuild the MkDocs site with security check"""
-        global rebuild_in_progress
+    def read_search_index() -> Optional[dict]:
+        try:
+            with open(MkDocsRebuilder.SEARCH_INDEX, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
 
-        if rebuild_in_progress:
+    @staticmethod
+    def merge_search_index(previous: Optional[dict]):
+        """Add back the entries of pages a dirty build did not re-render"""
+        current = MkDocsRebuilder.read_search_index()
+        if previous is None or current is None:
             return
+        rebuilt = {doc['location'].split('#')[0] for doc in current.get('docs', [])}
+        current['docs'] = [
+            doc for doc in previous.get('docs', [])
+            if doc['location'].split('#')[0] not in rebuilt
+        ] + current.get('docs', [])
+        tmp = MkDocsRebuilder.SEARCH_INDEX.with_suffix('.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(current, f)
+        os.replace(tmp, MkDocsRebuilder.SEARCH_INDEX)
+
+    @staticmethod
+    def record_verdict(verdict: dict):
+        """Store the build/scan outcome next to the site (blocking)"""
+        tmp = MkDocsRebuilder.BUILD_VERDICT.with_suffix('.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(verdict, f, indent=2)
+        os.replace(tmp, MkDocsRebuilder.BUILD_VERDICT)
 
-        rebuild_in_progress = True
+    @staticmethod
+    async def rebuild(changed: Optional[set] = None) -> bool:
+        """Rebuild the MkDocs site with security check (run via RebuildScheduler)
+
+        The security scan and the site build run concurrently: the scanners
+        read the content directory and mkdocs only writes the output, so the
+        build is started speculatively and the scan verdict is attached to it
+        once both finish. changed holds the content paths edited since the
+        last build, or None when unknown (forces a full build).
+        """
+        print("🔄 Starting site rebuild with security check...")
+        started = datetime.now()
+        scan = asyncio.create_task(SecurityScanner.scan())
         try:
-            print("🔄 Starting site rebuild with security check...")
+            built, mode = await MkDocsRebuilder.build(changed)
+            scan_passed = await scan
+        finally:
+            if not scan.done():
+                scan.cancel()  # Build superseded: drop its scan too
+
+        if built and not scan_passed:
+            print("⚠️  Site built despite security warnings - please review content")
+        MkDocsRebuilder.last_verdict = {
+            "started_at": started.isoformat(timespec='seconds'),
+            "finished_at": datetime.now().isoformat(timespec='seconds'),
+            "mode": mode,
+            "build_ok": built,
+            "scan_passed": scan_passed
+        }
+        try:
+            await asyncio.to_thread(MkDocsRebuilder.record_verdict, MkDocsRebuilder.last_verdict)
+        except OSError as e:
+            print(f"⚠️  Could not write build verdict: {e}")
+        return built
 
-            # Run security scan first
-            scan_passed = await SecurityScanner.scan()
-            if not scan_passed:
-                print("⚠️  Build proceeding despite security warnings - please review content")
+    @staticmethod
+    async def build(changed: Optional[set]) -> tuple:
+        """Run mkdocs build, streaming its log to connected editors
 
-            # Run mkdocs build
-            print("📚 Building MkDocs site...")
+        Returns (success, "incremental" or "full").
+        """
+        mode = "full"
+        try:
+            fingerprint = MkDocsRebuilder.fingerprint()
+            args = MkDocsRebuilder.build_args(changed)
+            if '--dirty' in args:
+                mode = "incremental"
+                message = f"📚 Rebuilding MkDocs site ({len(changed)} changed section(s))..."
+            else:
+                message = "📚 Building MkDocs site..."
+            print(message)
+            events.publish("log", {"line": message, "reset": True})
+            previous_index = None
+            if '--dirty' in args:
+                previous_index = await asyncio.to_thread(MkDocsRebuilder.read_search_index)
+            MkDocsRebuilder.last_fingerprint = None  # Until this build succeeds
             process = await asyncio.create_subprocess_exec(
-                'mkdocs', 'build', '--clean',
+                *args,
                 cwd=str(SITE_DIR),
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.STDOUT
             )
 
-            stdout, stderr = await process.communicate()
+            output = []
+            try:
+                async for raw in process.stdout:
+                    line = raw.decode(errors='replace').rstrip()
+                    output.append(line)
+                    events.publish("log", {"line": line})
+                await process.wait()
+            except asyncio.CancelledError:
+                process.kill()
+                await process.wait()
+                print("⏭️  MkDocs build superseded by a newer edit")
+                events.publish("log", {"line": "⏭️  Build superseded by a newer edit"})
+                raise
 
             if process.returncode == 0:
+                if '--dirty' in args:
+                    await asyncio.to_thread(MkDocsRebuilder.merge_search_index, previous_index)
+                MkDocsRebuilder.last_fingerprint = fingerprint
                 print("✅ MkDocs rebuild successful")
-            else:
-                print(f"❌ MkDocs rebuild failed: {stderr.decode()}")
+                events.publish("log", {"line": "✅ MkDocs rebuild successful"})
+                return True, mode
+            print(f"❌ MkDocs rebuild failed: {chr(10).join(output)}")
+            events.publish("log", {"line": "❌ MkDocs rebuild failed"})
 
         except Exception as e:
             print(f"❌ Rebuild error: {e}")
-        finally:
-            rebuild_in_progress = False
+            events.publish("log", {"line": f"❌ Rebuild error: {e}"})
+        return False, mode
+
+
+class RebuildScheduler:
+    """Coalesces rebuild triggers into at most one pending build
+
+    Every trigger bumps the dirty generation. The worker waits until triggers
+    have been quiet for the debounce delay, then builds whatever generation is
+    current, so any number of saves during a build cause exactly one more
+    build and the last edit is always built. The delay scales with the last
+    build time: fast builds give fast feedback, slow builds batch more edits.
+    """
+
+    def __init__(self, cancel_superseded: bool = False):
+        self.cancel_superseded = cancel_superseded
+        self.generation = 0          # bumped by every trigger
+        self.built_generation = 0    # newest generation a finished build covered
+        self.building_generation: Optional[int] = None
+        self.last_build_seconds: Optional[float] = None
+        self.last_build_ok: Optional[bool] = None
+        self.last_trigger = 0.0
+        self.changed: Optional[set] = set()  # None: unknown changes, build everything
+        self.wakeup = asyncio.Event()
+        self.current: Optional[asyncio.Task] = None
+
+    @property
+    def building(self) -> bool:
+        return self.building_generation is not None
+
+    @property
+    def queue_depth(self) -> int:
+        """Builds waiting to start: 0 or 1, however many triggers arrived"""
+        covered = self.building_generation if self.building else self.built_generation
+        return 1 if self.generation > covered else 0
+
+    def debounce(self) -> float:
+        if self.last_build_seconds is None:
+            return REBUILD_DEBOUNCE_MIN
+        return min(REBUILD_DEBOUNCE_MAX, max(REBUILD_DEBOUNCE_MIN, self.last_build_seconds / 4))
+
+    def trigger(self, path: Optional[Path] = None) -> int:
+        """Mark the site dirty; returns the generation that will include this change
+
+        path is the content file that changed; without one the next build is
+        a full build.
+        """
+        if path is None:
+            self.changed = None
+        elif self.changed is not None:
+            self.changed.add(path)
+        self.generation += 1
+        self.last_trigger = time.monotonic()
+        self.wakeup.set()
+        if self.cancel_superseded and self.current is not None and not self.current.done():
+            self.current.cancel()
+        publish_status()
+        return self.generation
+
+    def requeue(self, changed: Optional[set]):
+        """Carry the changes of a build that did not finish into the next one"""
+        if changed is None or self.changed is None:
+            self.changed = None
+        else:
+            self.changed |= changed
+
+    def stats(self) -> dict:
+        return {
+            "rebuild_in_progress": self.building,
+            "rebuild_queue_depth": self.queue_depth,
+            "dirty_generation": self.generation,
+            "build_generation": self.built_generation,
+            "building_generation": self.building_generation,
+            "last_build_seconds": self.last_build_seconds,
+            "last_build_ok": self.last_build_ok
+        }
+
+    async def run(self):
+        """Background worker: build until the site is clean, then sleep"""
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            if self.generation == self.built_generation:
+                continue
+
+            # Debounce: wait until no trigger arrived for the whole delay
+            while (quiet := time.monotonic() - self.last_trigger) < self.debounce():
+                await asyncio.sleep(self.debounce() - quiet)
+
+            generation = self.generation
+            changed, self.changed = self.changed, set()
+            self.building_generation = generation
+            publish_status()
+            started = time.monotonic()
+            self.current = asyncio.create_task(MkDocsRebuilder.rebuild(changed))
+            try:
+                await asyncio.wait({self.current})
+                if self.current.cancelled() or not self.current.result():
+                    self.requeue(changed)
+                if self.current.cancelled():
+                    continue  # Superseded: the newer trigger already set wakeup
+                self.last_build_ok = self.current.result()
+                self.last_build_seconds = time.monotonic() - started
+                # Failed builds count too: the next edit retries, not a loop
+                self.built_generation = generation
+            except Exception as e:
+                print(f"Rebuild worker error: {e}")
+                self.built_generation = generation
+            finally:
+                self.building_generation = None
+                self.current = None
+                publish_status()
+            if self.generation > self.built_generation:
+                self.wakeup.set()
+
+
+rebuild_scheduler = RebuildScheduler(cancel_superseded=CANCEL_SUPERSEDED_BUILDS)
+
+
+async def trigger_rebuild(path: Optional[Path] = None):
+    """Queue a rebuild (incremental when the changed content path is given)"""
+    return rebuild_scheduler.trigger(path)
+
+
+class ContentIndex:
+    """In-memory index of parsed content files, keyed by path and mtime
+
+    A watchdog observer (or the save path) marks files dirty; only those are
+    re-read. Without a running observer every listing re-stats the directory,
+    which still skips parsing unchanged files.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.entries: Dict[Path, ContentFile] = {}
+        self.mtimes: Dict[Path, int] = {}
+        self.sorted: List[ContentFile] = []
+        self.dirty = set()
+        self.stale = True
+        self.watching = False
+        self.lock = threading.Lock()
+
+    def invalidate(self, path: Optional[Path] = None):
+        """Mark one file (or, with no path, the whole directory) for re-reading"""
+        with self.lock:
+            if path is None:
+                self.stale = True
+            else:
+                self.dirty.add(path)
+
+    def _refresh(self, path: Path):
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            self.entries.pop(path, None)
+            self.mtimes.pop(path, None)
+            return
+        if self.mtimes.get(path) != mtime:
+            self.entries[path] = ContentFile(path)
+            self.mtimes[path] = mtime
+
+    def files(self) -> List[ContentFile]:
+        """All content files sorted by section number"""
+        with self.lock:
+            if not (self.stale or self.dirty or not self.watching):
+                return self.sorted
+            if self.stale or not self.watching:
+                paths = {p for p in self.directory.glob("*.md") if not p.name.startswith('.')}
+                for gone in set(self.entries) - paths:
+                    self.entries.pop(gone)
+                    self.mtimes.pop(gone, None)
+            else:
+                paths = {p for p in self.dirty if p.suffix == '.md' and not p.name.startswith('.')}
+            for path in paths:
+                self._refresh(path)
+            self.stale = False
+            self.dirty.clear()
+            self.sorted = sorted(self.entries.values(), key=lambda f: f.section_number)
+            return self.sorted
+
+    def update(self, content_file: ContentFile):
+        """Record a file the editor just wrote, so it is not parsed again"""
+        path = content_file.filepath
+        with self.lock:
+            try:
+                self.mtimes[path] = path.stat().st_mtime_ns
+            except OSError:
+                return
+            self.entries[path] = content_file
+            self.dirty.discard(path)
+            if not self.stale:
+                self.sorted = sorted(self.entries.values(), key=lambda f: f.section_number)
+
+    def get(self, filename: str) -> Optional[ContentFile]:
+        """Indexed ContentFile for a file name in the content directory"""
+        path = self.directory / filename
+        self.files()
+        return self.entries.get(path)
+
+
+class ContentChangeHandler(FileSystemEventHandler):
+    """Invalidates content index entries for files changed on disk"""
+
+    def __init__(self, index: ContentIndex):
+        self.index = index
+
+    def on_any_event(self, event):
+        # Reads (opened/closed events) by the scanners or mkdocs change nothing
+        if event.is_directory or event.event_type not in ('created', 'modified', 'deleted', 'moved'):
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path:
+                path = Path(os.fsdecode(path))
+                self.index.invalidate(path)
+                # Edits made outside the editor reach the site too; a save
+                # has already synced its file, so this finds nothing to do
+                if sync_work_copy(path) and events.loop is not None:
+                    events.loop.call_soon_threadsafe(rebuild_scheduler.trigger, path)
+        if events.subscribers and events.loop is not None:
+            events.loop.call_soon_threadsafe(publish_status)
+
+
+personaliser = personalise.Personaliser.from_env() if personalise else None
+
 
+def sync_work_copy(path: Path) -> bool:
+    """Re-personalise one content file into WORK_DIR; True if it changed (blocking)
 
-async def trigger_rebuild():
-    """Queue a rebuild"""
+    Does nothing unless the entrypoint created the working copy.
+    """
+    if personaliser is None or not WORK_DIR.is_dir() or path.name.startswith('.'):
+        return False  # Hidden names are the atomic-save temp files
     try:
-        rebuild_queue.put_nowait("rebuild")
-    except asyncio.QueueFull:
-        pass  # Already queued
+        return personaliser.sync_file(path.relative_to(CONTENT_DIR), CONTENT_DIR, WORK_DIR)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not sync {path.name} to {WORK_DIR}: {e}")
+        return False
+
+
+class _MkDocsConfigLoader(yaml.SafeLoader):
+    """SafeLoader that reads mkdocs.yml, ignoring !!python/ and !ENV style tags"""
+
 
+_MkDocsConfigLoader.add_multi_constructor('tag:yaml.org,2002:python/', lambda loader, suffix, node: None)
+_MkDocsConfigLoader.add_multi_constructor('!', lambda loader, suffix, node: None)
 
-async def rebuild_worker():
-    """Background worker to process rebuild queue"""
-    while True:
+
+class MarkdownRenderer:
+    """Renders one section's markdown with the site's markdown_extensions
+
+    HTML is cached by content hash in a small LRU, and the extension list is
+    re-read whenever mkdocs.yml changes. One Markdown instance is reused
+    (reset between documents) under a lock, since it is not thread-safe.
+    """
+
+    def __init__(self, config_path: Path, cache_size: int = 128):
+        self.config_path = config_path
+        self.cache_size = cache_size
+        self.cache: OrderedDict = OrderedDict()
+        self.config_mtime: Optional[int] = None
+        self.md = None
+        self.lock = threading.Lock()
+
+    def _load_config(self):
         try:
-            await rebuild_queue.get()
-            await asyncio.sleep(1)  # Debounce multiple rapid changes
-            await MkDocsRebuilder.rebuild()
-            rebuild_queue.task_done()
-        except Exception as e:
-            print(f"Rebuild worker error: {e}")
+            mtime = self.config_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if self.md is not None and mtime == self.config_mtime:
+            return
+        extensions, configs = [], {}
+        if mtime is not None:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config = yaml.load(f, Loader=_MkDocsConfigLoader) or {}
+            for entry in config.get('markdown_extensions') or []:
+                if isinstance(entry, dict):
+                    for name, options in entry.items():
+                        extensions.append(name)
+                        configs[name] = options or {}
+                else:
+                    extensions.append(entry)
+        self.md = markdown.Markdown(extensions=extensions, extension_configs=configs)
+        self.config_mtime = mtime
+        self.cache.clear()
+
+    def render(self, text: str) -> str:
+        """HTML for a markdown body (blocking - call from a worker thread)"""
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        with self.lock:
+            self._load_config()
+            html = self.cache.get(key)
+            if html is not None:
+                self.cache.move_to_end(key)
+                return html
+            html = self.md.reset().convert(text)
+            self.cache[key] = html
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return html
+
+
+content_index = ContentIndex(CONTENT_DIR)
+markdown_renderer = MarkdownRenderer(SITE_DIR / "mkdocs.yml")
+content_observer = None
+
+
+def start_content_watcher():
+    """Watch the content directory so the index only re-reads changed files"""
+    global content_observer
+    try:
+        observer = Observer()
+        observer.schedule(ContentChangeHandler(content_index), str(CONTENT_DIR), recursive=False)
+        observer.start()
+    except Exception as e:
+        print(f"⚠️  Content watcher unavailable, re-checking files on each request: {e}")
+        return
+    content_observer = observer
+    content_index.watching = True
+    content_index.invalidate()
 
 
 def get_content_files() -> List[ContentFile]:
     """Get all content files sorted by section number"""
-    files = []
-    for filepath in CONTENT_DIR.glob("*.md"):
-        if filepath.name.startswith('.'):
-            continue
-        files.append(ContentFile(filepath))
+    return content_index.files()
+
 
-    return sorted(files, key=lambda f: f.section_number)
+def status_snapshot() -> dict:
+    """Current editor, build and output state"""
+    return {
+        **rebuild_scheduler.stats(),
+        "scan_in_progress": scans_in_progress > 0,
+        "last_scan_passed": last_scan_passed,
+        "last_build": MkDocsRebuilder.last_verdict,
+        "content_files": len(get_content_files()),
+        "site_built": (OUTPUT_DIR / "site" / "index.html").exists(),
+        "pdf_exists": (OUTPUT_DIR / "site" / "Hit-By-A-Bus-Plan.pdf").exists(),
+        "security_scanner_available": detect_secrets_available()
+    }
+
+
+def publish_status():
+    """Push a status snapshot to connected editors (nothing to do when idle)"""
+    if events.subscribers:
+        events.publish("status", status_snapshot())
+
+
+# Background warm-up tasks run at startup: name -> pending/running/done/failed
+warmup_state: Dict[str, str] = {"content_index": "pending", "security_scan": "pending"}
+warmup_started = time.monotonic()
+background_tasks = set()
+
+
+async def warm_up(name: str, coroutine):
+    """Run one warm-up task, recording its progress for /api/ready"""
+    warmup_state[name] = "running"
+    try:
+        await coroutine
+        warmup_state[name] = "done"
+    except Exception as e:
+        warmup_state[name] = "failed"
+        print(f"⚠️  Warm-up {name} failed: {e}")
+
+
+def start_background(coroutine):
+    # Keep a reference so the task is not garbage collected mid-run
+    task = asyncio.create_task(coroutine)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Start background rebuild worker and run initial security scan"""
-    asyncio.create_task(rebuild_worker())
+    """Start background rebuild worker, then warm up without delaying requests"""
+    global warmup_started
+    events.loop = asyncio.get_running_loop()
+    start_background(rebuild_scheduler.run())
+    start_content_watcher()
 
-    # Run initial security scan
+    # Parse the content and run the initial security scan in the background
     print("🚀 Starting Hit By A Bus Plan Editor...")
-    await SecurityScanner.scan()
+    warmup_started = time.monotonic()
+    start_background(warm_up("content_index", asyncio.to_thread(content_index.files)))
+    start_background(warm_up("security_scan", SecurityScanner.scan()))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """End event streams and stop the content watcher"""
+    events.close()
+    if content_observer is not None:
+        content_observer.stop()
+        content_observer.join(timeout=2)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -288,11 +1014,10 @@ async def editor_home(request: Request):
 @app.get("/edit/{filename}", response_class=HTMLResponse)
 async def edit_file(request: Request, filename: str):
     """Edit a specific content file"""
-    filepath = CONTENT_DIR / filename
-    if not filepath.exists():
+    content_file = content_index.get(filename)
+    if content_file is None:
         raise HTTPException(status_code=404, detail="File not found")
 
-    content_file = ContentFile(filepath)
     return templates.TemplateResponse("edit_file.html", {
         "request": request,
         "file": content_file,
@@ -309,12 +1034,11 @@ async def save_file(
     body: str = Form(...)
 ):
     """Save changes to a content file with security scanning"""
-    filepath = CONTENT_DIR / filename
-    if not filepath.exists():
+    content_file = content_index.get(filename)
+    if content_file is None:
         raise HTTPException(status_code=404, detail="File not found")
 
-    content_file = ContentFile(filepath)
-    content_file.save(title, summary, critical, body)
+    await content_file.save(title, summary, critical, body)
 
     return RedirectResponse(url="/", status_code=303)
 
@@ -328,37 +1052,81 @@ async def preview_site(request: Request):
     })
 
 
+async def render_section(filename: str, body: Optional[str]) -> dict:
+    content_file = content_index.get(filename)
+    if content_file is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    if markdown is None:
+        raise HTTPException(status_code=503, detail="Markdown renderer not installed")
+    text = content_file.body if body is None else body
+    if personaliser is not None:
+        text = personaliser.apply(text)
+    try:
+        html = await asyncio.to_thread(markdown_renderer.render, text)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Render failed: {e}")
+    return {"filename": filename, "html": html}
+
+
+@app.get("/api/render/{filename}")
+async def api_render_saved(filename: str):
+    """Render a section's saved markdown"""
+    return await render_section(filename, None)
+
+
+@app.post("/api/render/{filename}")
+async def api_render(filename: str, body: str = Form("")):
+    """Render unsaved markdown for the live preview (nothing is written)"""
+    return await render_section(filename, body)
+
+
 @app.get("/api/rebuild")
 async def api_rebuild():
     """Manual rebuild trigger"""
-    await trigger_rebuild()
-    return {"status": "rebuild_queued"}
+    generation = await trigger_rebuild()
+    return {"status": "rebuild_queued", "generation": generation}
 
 
 @app.get("/api/status")
 async def api_status():
     """Get current status"""
-    return {
-        "rebuild_in_progress": rebuild_in_progress,
-        "content_files": len(get_content_files()),
-        "site_built": (OUTPUT_DIR / "site" / "index.html").exists(),
-        "pdf_exists": (OUTPUT_DIR / "site" / "Hit-By-A-Bus-Plan.pdf").exists(),
-        "security_scanner_available": await check_security_scanner()
-    }
+    return status_snapshot()
+
+
+@app.get("/api/live")
+async def api_live():
+    """Liveness: the server is accepting requests"""
+    return {"status": "alive"}
+
+
+@app.get("/api/ready")
+async def api_ready():
+    """Readiness: 200 once the startup warm-up has finished, 503 until then"""
+    ready = all(state in ("done", "failed") for state in warmup_state.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "warmup": warmup_state,
+            "elapsed_seconds": round(time.monotonic() - warmup_started, 2)
+        }
+    )
 
 
-async def check_security_scanner():
-    """Check if detect-secrets is available"""
-    try:
-        process = await asyncio.create_subprocess_exec(
-            'which', 'detect-secrets',
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        await process.communicate()
-        return process.returncode == 0
-    except:
-        return False
+@app.get("/api/events")
+async def api_events():
+    """Server-sent events: status snapshots on every change and live build output"""
+    return StreamingResponse(
+        events.stream(status_snapshot()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@lru_cache(maxsize=None)
+def detect_secrets_available() -> bool:
+    """Check once whether detect-secrets is installed"""
+    return shutil.which('detect-secrets') is not None
 
 
 @app.get("/api/security-scan")
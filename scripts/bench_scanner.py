@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Hit By A Bus Plan - Generic Scanner Benchmark
+Reproducible synthetic corpora, throughput metrics and a regression gate
+for scan_generic_secrets.py
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import scan_generic_secrets as scanner
+
+DEFAULT_BASELINE = Path(__file__).parent / "scanner_bench_baseline.json"
+
+WORDS = (
+    "bank account insurance policy mortgage pension contact solicitor executor "
+    "password vault locker keys documents renewal subscription utility council "
+    "doctor dentist vet pharmacy employer payroll shares broker statement office"
+).split()
+
+TEMPLATES = ("{{ person.name }}", "{{ person.pronouns }}", "{{ plan.title }}", "[your bank name]", "[my account]")
+
+
+# ---------- Synthetic values ----------
+def luhn_number(rng: random.Random, length: int, valid: bool = True) -> str:
+    """Card-like digit string whose Luhn check passes (or deliberately fails)"""
+    digits = [rng.randint(0, 9) for _ in range(length - 1)]
+    total = 0
+    for i, d in enumerate(reversed(digits)):
+        if i % 2 == 0:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    check = (10 - total % 10) % 10
+    if not valid:
+        check = (check + rng.randint(1, 9)) % 10
+    return "".join(map(str, digits)) + str(check)
+
+
+def grouped(number: str, sep: str) -> str:
+    return sep.join(number[i:i + 4] for i in range(0, len(number), 4))
+
+
+def valid_iban(rng: random.Random) -> str:
+    country = rng.choice(("DE", "GB", "FR", "NL", "ES"))
+    bban = "".join(str(rng.randint(0, 9)) for _ in range(18))
+    # Check digits make the mod-97 of (bban + country + "00") equal 1
+    rearranged = bban + "".join(str(ord(c) - 55) for c in country) + "00"
+    check = 98 - int(rearranged) % 97
+    return f"{country}{check:02d}{bban}"
+
+
+# ---------- Corpus kinds ----------
+def plan_section(rng: random.Random, size: int) -> str:
+    """Markdown plan section: front matter, headings, prose, templates, a few numbers"""
+    out = [f"---\ntitle: \"{rng.choice(WORDS).title()}\"\nupdated: \"2025-01-0{rng.randint(1, 9)}\"\ncritical: false\n---\n"]
+    n = len(out[0])
+    while n < size:
+        if rng.random() < 0.1:
+            line = f"\n## {rng.choice(WORDS).title()} {rng.choice(WORDS)}\n"
+        elif rng.random() < 0.2:
+            line = f"- {rng.choice(TEMPLATES)}: stored in {rng.choice(WORDS)} (ref {rng.randint(100, 99999)})\n"
+        elif rng.random() < 0.05:
+            line = f"```\nexample {grouped(luhn_number(rng, 16), ' ')}\n```\n"
+        else:
+            line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 16))) + ".\n"
+        out.append(line)
+        n += len(line)
+    return "".join(out)
+
+
+def numeric_table(rng: random.Random, size: int) -> str:
+    """Transaction-export style table: dense digits, dates, amounts, ids"""
+    out = ["| date | ref | amount | balance | account |\n|---|---|---|---|---|\n"]
+    n = len(out[0])
+    while n < size:
+        line = (f"| 2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+                f"| {rng.randint(10**5, 10**9)} | {rng.randint(1, 99999)}.{rng.randint(0, 99):02d} "
+                f"| {rng.randint(1, 10**6)} | {rng.randint(10**7, 10**10)} |\n")
+        out.append(line)
+        n += len(line)
+    return "".join(out)
+
+
+def card_spans(rng: random.Random, size: int) -> str:
+    """Card-number lines, half Luhn-valid, with mixed separators"""
+    out = []
+    n = 0
+    while n < size:
+        number = luhn_number(rng, rng.choice((13, 15, 16, 19)), valid=rng.random() < 0.5)
+        line = f"card {grouped(number, rng.choice((' ', '-', '')))} exp {rng.randint(1, 12):02d}/{rng.randint(25, 35)}\n"
+        out.append(line)
+        n += len(line)
+    return "".join(out)
+
+
+def iban_lines(rng: random.Random, size: int) -> str:
+    """Valid IBANs inside short sentences"""
+    out = []
+    n = 0
+    while n < size:
+        line = f"Transfer to IBAN {valid_iban(rng)} for {rng.choice(WORDS)}.\n"
+        out.append(line)
+        n += len(line)
+    return "".join(out)
+
+
+def binary_blob(rng: random.Random, size: int) -> bytes:
+    """Binary-looking bytes that the scanner should reject unread"""
+    return bytes(rng.getrandbits(8) for _ in range(size))
+
+
+CORPUS_KINDS = {
+    "sections": (plan_section, ".md"),
+    "tables": (numeric_table, ".md"),
+    "cards": (card_spans, ".txt"),
+    "ibans": (iban_lines, ".txt"),
+    "binary": (binary_blob, ".txt"),
+}
+
+
+def generate_corpus(root: Path, size_mb: float, seed: int, file_kb: int = 256) -> int:
+    """Write a reproducible corpus of roughly size_mb under root, returning bytes written"""
+    rng = random.Random(seed)
+    per_kind = int(size_mb * 1_000_000 / len(CORPUS_KINDS))
+    total = 0
+    for kind, (make, ext) in CORPUS_KINDS.items():
+        kind_dir = root / kind
+        kind_dir.mkdir(parents=True, exist_ok=True)
+        written = 0
+        i = 0
+        while written < per_kind:
+            data = make(rng, min(file_kb * 1000, per_kind - written))
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            (kind_dir / f"{kind}-{i:04d}{ext}").write_bytes(data)
+            written += len(data)
+            i += 1
+        total += written
+    return total
+
+
+# ---------- Regression cases ----------
+# (name, text, finding types expected); each text is scanned whole and
+# through the --stream path, which must not be much slower than the whole
+# scan. FILLER keeps findings outside every safe-context radius; BIG_FENCE is
+# longer than one stream chunk.
+CARD = "4539 5787 6362 1486"
+FILLER = " ".join(["lorem ipsum dolor"] * 15)
+BIG_FENCE = "```\n" + "lorem ipsum dolor sit amet\n" * 45000 + "```\n"
+NON_ASCII_CARDS = 8000
+STREAM_SLOWDOWN = 4
+
+REGRESSION_CASES = (
+    ("card in prose", f"{FILLER}\n\nMy card {CARD} is here.\n", ["CREDIT_CARD"]),
+    ("card in inline code", f"{FILLER}\n\nMy card `{CARD}` is here.\n", []),
+    ("card in fenced block", f"{FILLER}\n\n```\n{CARD}\n```\n", []),
+    ("stray backtick on each side of a card",
+     f"Don`t forget.\n\n{FILLER}\n\nMy card {CARD} is here.\n\n{FILLER}\n\nIt`s done.\n", ["CREDIT_CARD"]),
+    ("card between fenced blocks longer than a stream chunk",
+     f"{BIG_FENCE}\n{FILLER}\n\nMy card {CARD} is here.\n\n{FILLER}\n\n{BIG_FENCE}", ["CREDIT_CARD"]),
+    ("card deep inside a fenced block",
+     f"{BIG_FENCE[:-4]}My card {CARD} is here.\n{BIG_FENCE[4:]}", []),
+    ("many cards in non-ASCII text",
+     "".join(f"Reçu n° {i}: carte {CARD} débitée.\n" for i in range(NON_ASCII_CARDS)),
+     ["CREDIT_CARD"] * NON_ASCII_CARDS),
+)
+
+# Batch validators must agree with their scalar counterparts on any input,
+# including lengths and characters scan_text never passes them
+BATCH_INPUTS = [
+    "021000021", "011000015", "123456789", "0210000210", "02100002", "", "12345678901234567890",
+    "02100002a", "4539578763621486", "453957876362148", "DE89370400440532013000", "de89370400440532013000",
+    "GB29NWBK60161331926819", "GB29NWBK60161331926818", "4539-5787", "٠٢١٠٠٠٠٢١", "0" * 34,
+] * 5
+BATCH_VALIDATORS = (
+    ("luhn_ok_batch", scanner.luhn_ok_batch, scanner.luhn_ok),
+    ("iban_checksum_ok_batch", scanner.iban_checksum_ok_batch, scanner.iban_checksum_ok),
+    ("aba_ok_batch", scanner.aba_ok_batch, scanner.aba_ok),
+)
+
+
+def regression_failures() -> list[str]:
+    """Regression cases whose findings differ from the expected types, and
+    batch validators that disagree with the scalar ones"""
+    problems = []
+    for name, text, expected in REGRESSION_CASES:
+        start = time.perf_counter()
+        whole = [kind for kind, _, _, _ in scanner.scan_text("case.md", text)]
+        whole_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        streamed = [row["type"] for row in scanner.stream_file_rows("case.md", text.encode("utf-8"))]
+        stream_seconds = time.perf_counter() - start
+        for mode, found in (("scan", whole), ("stream", streamed)):
+            if sorted(found) != sorted(expected):
+                problems.append(f"{name} ({mode}): expected {dict(Counter(expected))}, found {dict(Counter(found))}")
+        if stream_seconds > STREAM_SLOWDOWN * whole_seconds + 0.5:
+            problems.append(f"{name} (stream): {stream_seconds:.2f} s vs {whole_seconds:.2f} s for the whole scan")
+    for name, batch, scalar in BATCH_VALIDATORS:
+        try:
+            mismatches = [v for v, ok in zip(BATCH_INPUTS, batch(BATCH_INPUTS)) if ok != scalar(v)]
+        except Exception as e:
+            mismatches = [f"{type(e).__name__}: {e}"]
+        if mismatches:
+            problems.append(f"{name} disagrees with the scalar check on mixed input: {mismatches[:3]}")
+    return problems
+
+
+# ---------- Measurements ----------
+def stage_times(text: str) -> dict:
+    """Seconds spent per scan stage/rule for one text, mirroring scan_text"""
+    times = {}
+
+    def timed(name, fn):
+        start = time.perf_counter()
+        result = fn()
+        times[name] = times.get(name, 0.0) + time.perf_counter() - start
+        return result
+
+    cand = timed("tokenize", lambda: scanner.find_candidates(text))
+    accounts = cand["ACCOUNT"]
+    timed("IBAN", lambda: scanner.iban_checksum_ok_batch([v for v, _, _ in cand["IBAN"]]))
+    timed("US_ROUTING", lambda: scanner.aba_ok_batch([v for v, _, _ in cand["US_ROUTING"]]))
+    timed("CREDIT_CARD", lambda: scanner.luhn_ok_batch(
+        [num for v, _, _ in cand["CREDIT_CARD"] if 12 <= len(num := scanner.normalize_number(v)) <= 19]))
+    for rule, partners, radius in (("UK_SORT", scanner.UK_ACCT, 60), ("AU_BSB", scanner.AU_ACCT, 60),
+                                   ("CA_TRANSIT", scanner.CA_INST, 80), ("CA_TRANSIT", scanner.CA_ACCT, 80),
+                                   ("IN_IFSC", scanner.IN_ACCT, 60)):
+        timed(rule, lambda: list(scanner.proximity_pairs(cand[rule], scanner.digits_between(accounts, *partners), radius)))
+    timed("NUM_NEAR", lambda: [s for _, s, e in cand["NUM_NEAR"] if scanner.CONTEXT.search(text[max(0, s - 60): e + 60])])
+    timed("false_positive", lambda: scanner.ContextIndex(text))
+    return times
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_benchmark(corpus: Path, repeat: int) -> dict:
+    paths = list(scanner.walk_files(str(corpus), 0, scanner.DEFAULT_INCLUDE_EXTS, scanner.DEFAULT_EXCLUDE_EXTS))
+    total_bytes = sum(os.path.getsize(p) for p in paths)
+
+    best = None
+    findings = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        findings = sum(1 for _ in scanner.scan_paths(str(corpus)))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    rules = {}
+    for path in paths:
+        text = scanner.read_text_file(path, 5_000_000)
+        if text is None:
+            continue
+        for name, secs in stage_times(text).items():
+            rules[name] = rules.get(name, 0.0) + secs
+
+    return {
+        "files": len(paths),
+        "bytes": total_bytes,
+        "seconds": round(best, 4),
+        "mb_per_s": round(total_bytes / 1_000_000 / best, 3),
+        "findings": findings,
+        "findings_per_s": round(findings / best, 1),
+        "rule_seconds": {k: round(v, 4) for k, v in sorted(rules.items())},
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions beyond tolerance (fraction) against the baseline"""
+    problems = []
+    for key in ("mb_per_s", "findings_per_s"):
+        old, new = baseline.get(key), result.get(key)
+        if old and new is not None and new < old * (1 - tolerance):
+            problems.append(f"{key} dropped {100 * (1 - new / old):.0f}%: {old} -> {new}")
+    if baseline.get("findings") is not None and baseline["findings"] != result["findings"]:
+        problems.append(f"findings changed: {baseline['findings']} -> {result['findings']} (rules changed? re-baseline)")
+    return problems
+
+
+def print_report(result: dict, corpus_desc: str):
+    print(f"📊 Scanner benchmark ({corpus_desc})")
+    print(f"  files:        {result['files']}")
+    print(f"  size:         {result['bytes'] / 1_000_000:.1f} MB")
+    print(f"  time:         {result['seconds']:.3f} s")
+    print(f"  throughput:   {result['mb_per_s']:.2f} MB/s")
+    print(f"  findings:     {result['findings']} ({result['findings_per_s']:.0f}/s)")
+    print(f"  peak RSS:     {result['peak_rss_mb']:.1f} MB")
+    print("  per rule:")
+    for name, secs in result["rule_seconds"].items():
+        print(f"    {name:<15} {secs:.4f} s")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark scan_generic_secrets.py on a reproducible synthetic corpus.")
+    p.add_argument("--size-mb", type=float, default=20, help="Approximate corpus size in MB (default 20)")
+    p.add_argument("--seed", type=int, default=1, help="Corpus random seed (default 1)")
+    p.add_argument("--corpus", help="Keep the generated corpus in this directory instead of a temp dir")
+    p.add_argument("--repeat", type=int, default=3, help="Scan the corpus N times and keep the best (default 3)")
+    p.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline results file")
+    p.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    p.add_argument("--compare", action="store_true", help="Exit 1 if results regress against the baseline")
+    p.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop as a fraction (default 0.2)")
+    p.add_argument("--json", action="store_true", help="Output JSON instead of a report")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="scanner-bench-") as tmp:
+        corpus = Path(args.corpus) if args.corpus else Path(tmp)
+        generate_corpus(corpus, args.size_mb, args.seed)
+        result = run_benchmark(corpus, args.repeat)
+    result["corpus"] = {"size_mb": args.size_mb, "seed": args.seed}
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result, f"{args.size_mb:g} MB, seed {args.seed}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"✅ Baseline saved: {baseline_path}", file=sys.stderr)
+        return
+
+    if args.compare:
+        failures = regression_failures()
+        if failures:
+            print("❌ Scanner regression cases failed:", file=sys.stderr)
+            for failure in failures:
+                print(f"  {failure}", file=sys.stderr)
+            sys.exit(1)
+        if not baseline_path.exists():
+            # Throughput is machine-specific: the first run on a machine sets the bar
+            baseline_path.write_text(json.dumps(result, indent=2) + "\n")
+            print(f"⚠️  No baseline at {baseline_path}; recorded this run as the baseline, nothing compared", file=sys.stderr)
+            return
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get("corpus") != result["corpus"]:
+            print("⚠️  Baseline was measured on a different corpus; comparing anyway", file=sys.stderr)
+        problems = compare(result, baseline, args.tolerance)
+        if problems:
+            print("❌ Scanner performance regression:", file=sys.stderr)
+            for problem in problems:
+                print(f"  {problem}", file=sys.stderr)
+            sys.exit(1)
+        print("✅ No regression against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Hit By A Bus Plan - Content Model
+Front matter parsing and serialisation shared by the editor and the exporters
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+# libyaml's C loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+FRONT_MATTER_DELIMITER = '---\n'
+
+# Parsed sections kept, keyed by a hash of the file's text
+PARSE_CACHE_SIZE = 256
+
+
+class Section:
+    """A content file split into its front matter and markdown body"""
+
+    __slots__ = ('front_matter', 'body')
+
+    def __init__(self, front_matter: dict, body: str):
+        self.front_matter = front_matter
+        self.body = body
+
+    @property
+    def title(self) -> Optional[str]:
+        return self.front_matter.get('title')
+
+    @property
+    def summary(self) -> str:
+        return self.front_matter.get('summary', '')
+
+    @property
+    def critical(self) -> bool:
+        return self.front_matter.get('critical', False)
+
+    @property
+    def updated(self) -> str:
+        return self.front_matter.get('updated', '')
+
+
+_parse_cache: OrderedDict = OrderedDict()
+_parse_lock = threading.Lock()
+
+
+def _split(text: str) -> Section:
+    if text.startswith(FRONT_MATTER_DELIMITER):
+        parts = text.split(FRONT_MATTER_DELIMITER, 2)
+        if len(parts) >= 3:
+            front_matter = yaml.load(parts[1], Loader=SafeLoader) or {}
+            return Section(front_matter, parts[2].strip())
+    return Section({}, text)
+
+
+def parse(text: str) -> Section:
+    """Split text into front matter and body
+
+    Results are cached by content hash, so unchanged files are never parsed
+    twice. Each call gets its own copy of the front matter dict; nested values
+    are shared with the cache and must not be modified in place. Raises
+    yaml.YAMLError for invalid front matter.
+    """
+    key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    with _parse_lock:
+        section = _parse_cache.get(key)
+        if section is not None:
+            _parse_cache.move_to_end(key)
+    if section is None:
+        section = _split(text)
+        with _parse_lock:
+            _parse_cache[key] = section
+            if len(_parse_cache) > PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+    return Section(dict(section.front_matter), section.body)
+
+
+def load(path: Path) -> Section:
+    """Read and parse a content file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse(f.read())
+
+
+def dump(front_matter: dict, body: str) -> str:
+    """Serialise front matter and body back to content file text"""
+    return (
+        FRONT_MATTER_DELIMITER
+        + yaml.dump(front_matter, Dumper=SafeDumper, default_flow_style=False)
+        + FRONT_MATTER_DELIMITER + "\n"
+        + body
+    )
@@ -29,36 +29,11 @@ if [ -n "$PERSON_NAME" ] && [ "$PERSON_NAME" != "Your Name Here" ] && [ "$PERSON
     PLAN_TITLE=${PLAN_TITLE:-"$PERSON_NAME's Emergency Plan"}
     PLAN_SUBTITLE=${PLAN_SUBTITLE:-"Emergency Information Guide"}
 
-    # Create working copy of content (don't modify mounted volumes)
-    echo "📁 Creating working copy of content..."
-    rm -rf /app/content-work
-    cp -r /app/content /app/content-work
-
-    # Apply direct template substitution to working content files
-    find /app/content-work -name "*.md" -type f | while read -r file; do
-        # Skip if file doesn't exist or is not readable
-        [ -r "$file" ] || continue
-
-        # Create temporary file
-        temp_file=$(mktemp)
-
-        # Apply substitutions using | delimiter to avoid issues with special characters
-        PDF_FILENAME="$(echo "$PERSON_NAME" | tr ' ' '-')-Emergency-Plan.pdf"
-        sed -e "s|{{ person.name }}|$PERSON_NAME|g" \
-            -e "s|{{ person.pronouns }}|$PERSON_PRONOUNS|g" \
-            -e "s|{{ person.relationship }}|$PERSON_RELATIONSHIP|g" \
-            -e "s|{{ plan.title }}|$PLAN_TITLE|g" \
-            -e "s|{{ plan.subtitle }}|$PLAN_SUBTITLE|g" \
-            -e "s|{{ plan.description }}|What to do if something happens to $PERSON_NAME|g" \
-            -e "s|{{ branding.site_name }}|$PLAN_TITLE|g" \
-            -e "s|{{ branding.pdf_filename }}|$PDF_FILENAME|g" \
-            -e "s|{{ branding.author }}|$PERSON_NAME|g" \
-            -e "s|Hit-By-A-Bus-Plan.pdf|$PDF_FILENAME|g" \
-            "$file" > "$temp_file"
-
-        # Replace working file
-        mv "$temp_file" "$file"
-    done
+    # Personalise into a working copy (don't modify mounted volumes); only
+    # files that differ from the existing copy are rewritten
+    echo "📁 Syncing personalised working copy of content..."
+    export PERSON_NAME PERSON_PRONOUNS PERSON_RELATIONSHIP PLAN_TITLE PLAN_SUBTITLE
+    python3 /app/scripts/personalise.py --content /app/content --work /app/content-work
 
     # Create a personalized mkdocs.yml pointing to working content
     if [ -f "/app/site-template/mkdocs.yml" ]; then
@@ -141,17 +116,21 @@ fi
 
 # 2. Generic secrets scan (credit cards, IBANs, etc)
 if [ -f "/app/scripts/scan_generic_secrets.py" ]; then
-    python3 /app/scripts/scan_generic_secrets.py /app/content --exit-code --quiet >/dev/null 2>&1
+    python3 /app/scripts/scan_generic_secrets.py /app/content --cache /app/output/.generic-scan-cache.json --exit-code --quiet >/dev/null 2>&1
     if [ $? -ne 0 ]; then
         echo "⚠️  Generic secrets scan found financial data:"
-        python3 /app/scripts/scan_generic_secrets.py /app/content --json 2>/dev/null | python3 -c "
+        python3 /app/scripts/scan_generic_secrets.py /app/content --cache /app/output/.generic-scan-cache.json --jsonl 2>/dev/null | python3 -c "
 import json, sys
 try:
-    data = json.load(sys.stdin)
-    for item in data[:3]:  # Show first 3 findings
-        print(f\"  {item['type']} in {item['file']}:{item['line']} - {item['value_masked']}\")
-    if len(data) > 3:
-        print(f\"  ... and {len(data)-3} more findings\")
+    shown = 0
+    for line in sys.stdin:
+        item = json.loads(line)
+        if 'summary' in item:
+            if item['summary']['findings'] > shown:
+                print(f\"  ... and {item['summary']['findings']-shown} more findings\")
+        elif shown < 3:  # Show first 3 findings
+            print(f\"  {item['type']} in {item['file']}:{item['line']} - {item['value_masked']}\")
+            shown += 1
 except:
     pass
 "
@@ -189,8 +168,11 @@ if [ "$ENABLE_EDITOR" = "true" ]; then
     python app.py &
     EDITOR_PID=$!
 
-    # Wait for Editor to start
-    sleep 3
+    # Wait for Editor to accept requests (its warm-up continues in the background)
+    for _ in $(seq 1 50); do
+        curl -sf "http://localhost:${EDITOR_PORT}/api/live" >/dev/null 2>&1 && break
+        sleep 0.2
+    done
 
     echo ""
     echo "🎉 Started with live editing enabled!"
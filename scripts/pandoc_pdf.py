@@ -4,13 +4,15 @@ Hit By A Bus Plan - Pandoc PDF Generator
 Simple, reliable PDF generation using Pandoc + LaTeX
 """
 
+import os
 import subprocess
 import sys
 import re
 from pathlib import Path
-import yaml
 from datetime import date
 
+from content_model import load as load_section
+
 def clean_unicode_for_latex(text: str) -> str:
     """Remove Unicode characters that cause LaTeX issues"""
     # Remove emojis, variation selectors, and other problematic Unicode
@@ -139,26 +141,13 @@ toc-depth: 2
 
     for file_path in content_files:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Parse front matter
-            if content.startswith('---\n'):
-                parts = content.split('---\n', 2)
-                if len(parts) >= 3:
-                    front_matter = yaml.safe_load(parts[1]) or {}
-                    body = parts[2].strip()
-                else:
-                    front_matter = {}
-                    body = content
-            else:
-                front_matter = {}
-                body = content
+            section = load_section(file_path)
+            body = section.body
 
             # Add section header
-            title = front_matter.get('title', 'Section')
-            critical = front_matter.get('critical', False)
-            updated = front_matter.get('updated', '')
+            title = 'Section' if section.title is None else section.title
+            critical = section.critical
+            updated = section.updated
 
             # Remove emojis and problematic Unicode for PDF
             title_clean = clean_unicode_for_latex(title)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Hit By A Bus Plan - Personalisation
+Fills in {{ person.* }}, {{ plan.* }} and {{ branding.* }} placeholders while
+mirroring content/ into the working copy that MkDocs and Pandoc build from.
+
+The container entrypoint syncs the whole tree at start-up; the editor syncs
+single files after each save or watcher event.
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# PERSON_NAME values that mean "not personalised yet"
+PLACEHOLDER_NAMES = ("", "Your Name Here", "Your Name")
+
+# Default download name in the template content, replaced by the personal one
+TEMPLATE_PDF_FILENAME = "Hit-By-A-Bus-Plan.pdf"
+
+
+def substitutions_from_env(environ=None) -> Dict[str, str]:
+    """Placeholder -> value mapping from the environment (empty if not personalised)"""
+    env = os.environ if environ is None else environ
+    name = env.get("PERSON_NAME", "")
+    if name in PLACEHOLDER_NAMES:
+        return {}
+
+    plan_title = env.get("PLAN_TITLE") or f"{name}'s Emergency Plan"
+    pdf_filename = f"{name.replace(' ', '-')}-Emergency-Plan.pdf"
+    return {
+        "{{ person.name }}": name,
+        "{{ person.pronouns }}": env.get("PERSON_PRONOUNS") or "they/them",
+        "{{ person.relationship }}": env.get("PERSON_RELATIONSHIP") or "me",
+        "{{ plan.title }}": plan_title,
+        "{{ plan.subtitle }}": env.get("PLAN_SUBTITLE") or "Emergency Information Guide",
+        "{{ plan.description }}": f"What to do if something happens to {name}",
+        "{{ branding.site_name }}": plan_title,
+        "{{ branding.pdf_filename }}": pdf_filename,
+        "{{ branding.author }}": name,
+        TEMPLATE_PDF_FILENAME: pdf_filename,
+    }
+
+
+class Personaliser:
+    """Single-pass placeholder substitution and content/ -> work copy sync
+
+    All placeholders are matched by one precompiled alternation, so each file
+    is scanned once and substituted values are never re-expanded. With no
+    substitutions files are copied unchanged.
+    """
+
+    def __init__(self, substitutions: Dict[str, str]):
+        self.substitutions = dict(substitutions)
+        self.pattern: Optional[re.Pattern] = None
+        if self.substitutions:
+            # Longest first, so no placeholder can shadow one it prefixes
+            keys = sorted(self.substitutions, key=len, reverse=True)
+            self.pattern = re.compile("|".join(re.escape(k) for k in keys))
+
+    @classmethod
+    def from_env(cls, environ=None) -> "Personaliser":
+        return cls(substitutions_from_env(environ))
+
+    @property
+    def enabled(self) -> bool:
+        return self.pattern is not None
+
+    def apply(self, text: str) -> str:
+        if self.pattern is None:
+            return text
+        lookup = self.substitutions
+        return self.pattern.sub(lambda m: lookup[m.group(0)], text)
+
+    def render(self, source: Path) -> Optional[bytes]:
+        """Personalised bytes of a markdown file, or None to copy it as-is"""
+        if source.suffix != ".md" or self.pattern is None:
+            return None
+        data = source.read_bytes()
+        try:
+            return self.apply(data.decode("utf-8")).encode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+    def sync_file(self, relative: Path, content_dir: Path, work_dir: Path) -> bool:
+        """Bring one file of the work copy up to date; True if it changed"""
+        source = content_dir / relative
+        target = work_dir / relative
+
+        if not source.is_file():
+            if target.is_file():
+                target.unlink()
+                return True
+            return False
+
+        data = self.render(source)
+        if data is None:
+            stat = source.stat()
+            try:
+                current = target.stat()
+                if current.st_size == stat.st_size and current.st_mtime_ns == stat.st_mtime_ns:
+                    return False
+            except OSError:
+                pass
+        else:
+            try:
+                if target.read_bytes() == data:
+                    return False  # Unchanged: keep the mtime so mkdocs --dirty skips it
+            except OSError:
+                pass
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            if data is None:
+                os.close(fd)
+                shutil.copy2(source, tmp)
+            else:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return True
+
+    def sync_tree(self, content_dir: Path, work_dir: Path) -> Tuple[int, int]:
+        """Sync every file and drop files that left content/; returns (written, removed)"""
+        written = removed = 0
+        sources = set()
+        for root, _dirs, files in os.walk(content_dir):
+            for name in files:
+                relative = Path(root, name).relative_to(content_dir)
+                sources.add(relative)
+                written += self.sync_file(relative, content_dir, work_dir)
+
+        for root, _dirs, files in os.walk(work_dir, topdown=False):
+            for name in files:
+                relative = Path(root, name).relative_to(work_dir)
+                if relative not in sources:
+                    (work_dir / relative).unlink()
+                    removed += 1
+            if Path(root) != work_dir and not (content_dir / Path(root).relative_to(work_dir)).is_dir():
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    pass
+        return written, removed
+
+
+def main():
+    p = argparse.ArgumentParser(description="Personalise content into the working copy MkDocs builds from.")
+    p.add_argument("paths", nargs="*", help="Files to sync, relative to --content (default: the whole tree)")
+    p.add_argument("--content", default="/app/content", help="Source content directory")
+    p.add_argument("--work", default="/app/content-work", help="Personalised working copy")
+    p.add_argument("--quiet", action="store_true", help="Do not print a summary")
+    args = p.parse_args()
+
+    content_dir, work_dir = Path(args.content), Path(args.work)
+    if not content_dir.is_dir():
+        print(f"Content directory not found: {content_dir}", file=sys.stderr)
+        sys.exit(2)
+
+    personaliser = Personaliser.from_env()
+    work_dir.mkdir(parents=True, exist_ok=True)
+    if args.paths:
+        written = sum(personaliser.sync_file(Path(path), content_dir, work_dir) for path in args.paths)
+        removed = 0
+    else:
+        written, removed = personaliser.sync_tree(content_dir, work_dir)
+
+    if not args.quiet:
+        state = "personalised" if personaliser.enabled else "copied"
+        print(f"{written} file(s) {state}, {removed} removed, into {work_dir}")
+
+
+if __name__ == "__main__":
+    main()
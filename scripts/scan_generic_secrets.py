@@ -1,12 +1,26 @@
 #!/usr/bin/env python3
 import argparse
 import base64
+import bisect
+import codecs
 import csv
+import hashlib
 import io
 import json
+import mmap
 import os
 import re
+import signal
+import socket
+import socketserver
+import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # Optional: batch validation falls back to pure Python
+    np = None
 
 # ---------- Credit cards (ccextractor-style) ----------
 # Accept 12-19 digits, allow spaces/dashes, reject if not Luhn-valid.
@@ -47,22 +61,24 @@ def card_brand(num: str) -> str:
     return "unknown"
 
 # ---------- IBAN ----------
-IBAN_RE = re.compile(r"\b(?=.{15,34}\b)[A-Z]{2}\d{2}[A-Z0-9]+\b")
+# Matched against a whole upper-cased word; IBAN_SPAN is the look-ahead that
+# requires a word boundary 15-34 characters after the start of the word.
+IBAN_RE = re.compile(r"[A-Z]{2}\d{2}[A-Z0-9]+")
+IBAN_SPAN = re.compile(r"(?=.{15,34}\b)")
 
 def iban_checksum_ok(iban: str) -> bool:
     s = (iban[4:] + iban[:4]).upper()
-    mapped = []
+    mod = 0
     for c in s:
-        if c.isalpha():
-            mapped.append(str(ord(c) - 55))  # A=10, Z=35
+        if "A" <= c <= "Z":
+            mod = (mod * 100 + ord(c) - 55) % 97  # A=10, Z=35: two digits
         else:
-            mapped.append(c)
-    mod = 0
-    for ch in "".join(mapped):
-        mod = (mod * 10 + (ord(ch) - 48)) % 97
+            mod = (mod * 10 + (ord(c) - 48)) % 97
     return mod == 1
 
 # ---------- ABA routing ----------
+ABA_RE = re.compile(r"\b\d{9}\b")
+
 def aba_ok(routing: str) -> bool:
     if not (routing.isdigit() and len(routing) == 9):
         return False
@@ -70,39 +86,197 @@ def aba_ok(routing: str) -> bool:
     total = sum(int(d) * w[i % 3] for i, d in enumerate(routing))
     return total % 10 == 0
 
+# ---------- Batch validation ----------
+# Numeric-dense files yield thousands of candidates per rule. With NumPy the
+# checksums for a whole batch are computed over one fixed-width array of
+# character codes, right-aligned so that column k is the k-th character from
+# the end; left padding is "0", which leaves Luhn, mod-97 and ABA unchanged.
+# Small batches and non-ASCII candidates (Unicode digits match \d) use the
+# scalar validators, which define the semantics.
+BATCH_MIN = 64
+
+def _pack(values: list[str], width: int):
+    # (n, width) uint8 array of character codes, right-aligned, "0"-padded
+    joined = "".join(v.rjust(width, "0") for v in values).encode("ascii")
+    return np.frombuffer(joined, dtype=np.uint8).reshape(len(values), width)
+
+def _batch(values: list[str], scalar, vectorised) -> list[bool]:
+    if np is None or len(values) < BATCH_MIN:
+        return [scalar(v) for v in values]
+    ok = [False] * len(values)
+    index = []
+    for i, v in enumerate(values):
+        if v.isascii():
+            index.append(i)
+        else:
+            ok[i] = scalar(v)
+    if index:
+        for i, good in zip(index, vectorised([values[i] for i in index]).tolist()):
+            ok[i] = good
+    return ok
+
+LUHN_DOUBLE = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+def _luhn_vectorised(nums: list[str]):
+    codes = _pack(nums, max(map(len, nums))).astype(np.int16) - 48
+    valid = ((codes >= 0) & (codes <= 9)).all(axis=1)
+    digits = np.clip(codes, 0, 9)
+    # Every second digit from the right is doubled (digit sum of 2d)
+    digits[:, -2::-2] = np.asarray(LUHN_DOUBLE, dtype=np.int16)[digits[:, -2::-2]]
+    return valid & (digits.sum(axis=1) % 10 == 0)
+
+def _iban_vectorised(ibans: list[str]):
+    rotated = [(v[4:] + v[:4]).upper() for v in ibans]
+    codes = _pack(rotated, max(map(len, rotated))).astype(np.int64)
+    letter = (codes >= 65) & (codes <= 90)
+    values = np.where(letter, codes - 55, codes - 48)
+    scale = np.where(letter, 100, 10)
+    mod = np.zeros(len(rotated), dtype=np.int64)
+    for col in range(codes.shape[1]):
+        mod = (mod * scale[:, col] + values[:, col]) % 97
+    return mod == 1
+
+ABA_WEIGHTS = (3, 7, 1) * 3
+
+def _aba_vectorised(routings: list[str]):
+    well_formed = [len(r) == 9 and r.isdigit() for r in routings]
+    # Anything else is invalid: pack zeros so every row is exactly 9 wide
+    codes = _pack([r if good else "0" * 9 for r, good in zip(routings, well_formed)], 9).astype(np.int32) - 48
+    ok = np.array(well_formed)
+    total = codes @ np.asarray(ABA_WEIGHTS, dtype=np.int32)
+    return ok & (total % 10 == 0)
+
+def luhn_ok_batch(nums: list[str]) -> list[bool]:
+    return _batch(nums, luhn_ok, _luhn_vectorised)
+
+def iban_checksum_ok_batch(ibans: list[str]) -> list[bool]:
+    return _batch(ibans, iban_checksum_ok, _iban_vectorised)
+
+def aba_ok_batch(routings: list[str]) -> list[bool]:
+    return _batch(routings, aba_ok, _aba_vectorised)
+
 # ---------- Country-ish patterns (format + proximity) ----------
+# Partners are whole digit words, given as (shortest, longest) lengths
 UK_SORT = re.compile(r"\b\d{2}-?\d{2}-?\d{2}\b")
-UK_ACCT = re.compile(r"\b\d{8}\b")
+UK_ACCT = (8, 8)
 
 AU_BSB = re.compile(r"\b\d{3}-?\d{3}\b")
-AU_ACCT = re.compile(r"\b\d{6,10}\b")
+AU_ACCT = (6, 10)
 
 CA_TRANSIT = re.compile(r"\b\d{5}\b")
-CA_INST = re.compile(r"\b\d{3}\b")
-CA_ACCT = re.compile(r"\b\d{7,12}\b")
+CA_INST = (3, 3)
+CA_ACCT = (7, 12)
 
 IN_IFSC = re.compile(r"\b[A-Z]{4}0\d{6}\b")
-IN_ACCT = re.compile(r"\b\d{9,18}\b")
+IN_ACCT = (9, 18)
 
 CONTEXT = re.compile(r"(?i)\b(iban|routing|aba|bsb|sort\s*code|ifsc|account|acct|iban:|iban\s*no|iban#|iban number)\b")
 
 NUM_NEAR = re.compile(r"\b\d[\d \-]{6,}\d\b")  # longish numeric spans for context scan
 
+# ---------- Single-pass candidate tokenizer ----------
+# One walk over the text finds every span any rule could match: runs of
+# all-digit words joined only by spaces/dashes, and IBAN/IFSC-shaped words.
+# Every numeric rule needs a word boundary on both ends and only consumes
+# digits, spaces and dashes, so its matches always fall inside one run.
+CANDIDATE_TOKEN = re.compile(
+    r"(?P<run>\b\d+\b(?:[ \-]+\d+\b)*)"
+    r"|(?P<word>\b(?:[A-Za-z]{2}\d{2}|[A-Za-z]{4}0\d)\w*)"
+)
+
+# Order matters: findings are reported grouped by rule in this order.
+# ACCOUNT holds every all-digit word, the partners for the proximity rules.
+CANDIDATE_RULES = ("IBAN", "US_ROUTING", "CREDIT_CARD", "UK_SORT", "AU_BSB", "CA_TRANSIT", "IN_IFSC", "NUM_NEAR", "ACCOUNT")
+
+DIGIT_WORD = re.compile(r"\d+")
+
+# Rules re-matched inside runs that contain separators
+RUN_PATTERNS = (
+    ("US_ROUTING", ABA_RE),
+    ("CREDIT_CARD", CC_SPAN),
+    ("UK_SORT", UK_SORT),
+    ("AU_BSB", AU_BSB),
+    ("CA_TRANSIT", CA_TRANSIT),
+    ("NUM_NEAR", NUM_NEAR),
+)
+
 # ---------- False positive patterns ----------
-# Common test/example patterns to ignore
+# Common test/example values to ignore, matched against the finding itself
 TEST_PATTERNS = [
     re.compile(r"\b(4111\s*1111\s*1111\s*1111|4000\s*0000\s*0000\s*0002)\b"),  # Test credit cards
     re.compile(r"\b(5555\s*5555\s*5555\s*4444|5105\s*1051\s*0510\s*5100)\b"),  # Test mastercards
     re.compile(r"\b(example|test|dummy|fake|sample|placeholder)\b", re.IGNORECASE),
     re.compile(r"\b(xxxx|1234\s*1234|0000\s*0000)\b"),  # Obvious placeholders
+]
+
+# Placeholders a finding may sit inside
+PLACEHOLDER_PATTERNS = [
     re.compile(r"\[(your|my|their)\s+(account|card|bank|name)\]", re.IGNORECASE),  # Markdown placeholders
     re.compile(r"\{\{\s*(person|account|bank)\.\w+\s*\}\}", re.IGNORECASE),  # Template variables
 ]
 
+# Fenced code blocks, then inline code spans (which end at a blank line, so
+# stray backticks in different paragraphs never pair up). Fences pair across
+# the whole document: a window of it must use the document's code spans.
+CODE_SPAN = re.compile(r"^[ \t]*(`{3,}|~{3,})[^\n]*\n.*?^[ \t]*\1[ \t]*$|`(?:[^`\n]|\n(?![ \t]*\n))+`", re.MULTILINE | re.DOTALL)
+# Same spans over raw bytes: backticks, tildes and line breaks are ASCII, so
+# in UTF-8 and latin-1 the byte spans are exactly the character spans
+CODE_SPAN_BYTES = re.compile(CODE_SPAN.pattern.encode(), CODE_SPAN.flags & ~re.UNICODE)
+
 # Context that suggests this is instructional/example content
-SAFE_CONTEXT = re.compile(r"(?i)\b(example|template|placeholder|sample|format|like|such as|e\.g\.|for instance|emergency plan|guide|documentation)\b")
+# (line breaks count as spaces inside the multi-word phrases)
+SAFE_CONTEXT = re.compile(r"(?i)\b(example|template|placeholder|sample|format|like|such[ \n]as|e\.g\.|for[ \n]instance|emergency[ \n]plan|guide|documentation)\b")
+SAFE_CONTEXT_RADIUS = 80
+
+def _span_index(spans) -> tuple[list[int], list[int]]:
+    # Sorted, merged (starts, ends) so containment is one bisect
+    starts, ends = [], []
+    for s, e in sorted(spans):
+        if ends and s <= ends[-1]:
+            ends[-1] = max(ends[-1], e)
+        else:
+            starts.append(s)
+            ends.append(e)
+    return starts, ends
+
+def _covers(index: tuple[list[int], list[int]], start: int, end: int) -> bool:
+    starts, ends = index
+    i = bisect.bisect_right(starts, start) - 1
+    return i >= 0 and ends[i] >= end
+
+def code_spans(text) -> tuple[list[int], list[int]]:
+    """Span index of the code blocks and inline code in a whole document (str or bytes)"""
+    pattern = CODE_SPAN if isinstance(text, str) else CODE_SPAN_BYTES
+    return _span_index(m.span() for m in pattern.finditer(text))
+
+class ContextIndex:
+    """Code spans, placeholders and safe-context keywords of one text, found in one pass each
+
+    When text is a window of a larger document, pass in_code: a containment
+    test in window offsets against the document's code spans.
+    """
+
+    def __init__(self, text: str, in_code=None):
+        self.length = len(text)
+        if in_code is None:
+            code = code_spans(text)
+            in_code = lambda start, end: _covers(code, start, end)
+        self.in_code = in_code
+        self.placeholders = _span_index(m.span() for p in PLACEHOLDER_PATTERNS for m in p.finditer(text))
+        self.safe = _span_index(m.span() for m in SAFE_CONTEXT.finditer(text))
 
-def is_likely_false_positive(raw: str, context: str) -> bool:
+    def in_placeholder(self, start: int, end: int) -> bool:
+        return _covers(self.placeholders, start, end)
+
+    def near_safe_context(self, start: int, end: int, radius: int = SAFE_CONTEXT_RADIUS) -> bool:
+        # Any keyword lying wholly within radius chars of the finding
+        lo = max(0, start - radius)
+        hi = min(self.length, end + radius)
+        starts, ends = self.safe
+        i = bisect.bisect_left(starts, lo)
+        return i < len(starts) and ends[i] <= hi
+
+def is_likely_false_positive(raw: str, start: int, end: int, index: ContextIndex) -> bool:
     """Check if this finding is likely a false positive"""
     # Check against known test patterns
     for pattern in TEST_PATTERNS:
@@ -110,11 +284,11 @@ def is_likely_false_positive(raw: str, context: str) -> bool:
             return True
 
     # Check if surrounded by safe context
-    if SAFE_CONTEXT.search(context):
+    if index.near_safe_context(start, end):
         return True
 
     # Check for markdown formatting that suggests examples
-    if re.search(r"`[^`]*" + re.escape(raw) + r"[^`]*`", context):  # In code blocks
+    if index.in_code(start, end) or index.in_placeholder(start, end):
         return True
 
     return False
@@ -132,33 +306,64 @@ def mask_value(kind: str, raw: str) -> str:
         return raw[:4] + "…" + raw[-2:]
     return raw
 
+TEXT_BYTES = bytes(range(32, 127)) + b"\t\n\r"
+
 def is_probably_binary(chunk: bytes) -> bool:
     # Heuristic: a NUL byte or very high ratio of non-text control chars
     if b"\x00" in chunk:
         return True
-    textlike = sum((32 <= b <= 126) or b in (9, 10, 13) for b in chunk)
-    return textlike / max(1, len(chunk)) < 0.80
+    other = len(chunk.translate(None, TEXT_BYTES))  # Counted in C, not per byte
+    return (len(chunk) - other) / max(1, len(chunk)) < 0.80
+
+def decode_text(data: bytes) -> str | None:
+    if is_probably_binary(data):
+        return None
+    # Try utf-8, fall back to latin-1 lossless
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1", errors="ignore")
 
 def read_text_file(path: str, max_bytes: int) -> str | None:
     try:
         with open(path, "rb") as f:
             data = f.read(max_bytes)
-            if is_probably_binary(data):
-                return None
-            # Try utf-8, fall back to latin-1 lossless
-            try:
-                return data.decode("utf-8")
-            except UnicodeDecodeError:
-                return data.decode("latin-1", errors="ignore")
     except Exception:
         return None
+    return decode_text(data)
+
+# ---------- Byte-level prefilter ----------
+# Every finding needs an IBAN-shaped word or a numeric span of at least six
+# characters (a 6-digit BSB/account, or NUM_NEAR's 8) that starts and ends
+# with a digit. Files without one are rejected before decoding. Unicode
+# digits also match \d, so non-ASCII data is re-checked as text.
+CANDIDATE_BYTES = re.compile(rb"[0-9][0-9 \-]{4,}[0-9]|[A-Za-z]{2}[0-9]{2}")
+CANDIDATE_TEXT = re.compile(r"\d[\d \-]{4,}\d|[A-Za-z]{2}\d{2}")
+NON_ASCII_BYTE = re.compile(rb"[\x80-\xff]")
+
+def may_contain_findings(data) -> bool:
+    """Conservative check on raw bytes (or an mmap): False means no rule can match"""
+    return bool(CANDIDATE_BYTES.search(data) or NON_ASCII_BYTE.search(data))
+
+def decode_candidate_text(data: bytes) -> str | None:
+    """decode_text, or None when data cannot contain any finding"""
+    if not CANDIDATE_BYTES.search(data) and data.isascii():
+        return None
+    text = decode_text(data)
+    if text is None or text.isascii() or CANDIDATE_TEXT.search(text):
+        return text
+    return None
 
-def iter_lines_with_offsets(text: str):
-    # yield (line_no starting at 1, line_text, line_start_offset)
-    off = 0
-    for i, line in enumerate(text.splitlines(keepends=True), 1):
-        yield i, line, off
-        off += len(line)
+# Same line boundaries as str.splitlines()
+LINE_BREAK = re.compile(r"\r\n|[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]")
+
+def line_offsets(text: str) -> list[int]:
+    # Start offset of every line, built once per file
+    return [0] + [m.end() for m in LINE_BREAK.finditer(text)]
+
+def line_number(offsets: list[int], pos: int) -> int:
+    # 1-based line containing character offset pos
+    return bisect.bisect_right(offsets, pos)
 
 def snippet(text: str, start: int, end: int, radius: int = 40) -> str:
     s = max(0, start - radius)
@@ -166,94 +371,145 @@ def snippet(text: str, start: int, end: int, radius: int = 40) -> str:
     return text[s:e].replace("\n", " ")
 
 # ---------- Scan routines ----------
-def scan_text(path: str, text: str):
+def card_span_end(text: str, end: int) -> int:
+    # CC_SPAN lets the last digit keep its optional separator when a word
+    # character follows it, so a card span can end one past its digit run.
+    if end + 1 < len(text) and text[end] in " -":
+        nxt = text[end + 1]
+        if nxt.isalnum() or nxt == "_":
+            return end + 1
+    return end
+
+def find_candidates(text: str) -> dict[str, list[tuple[str, int, int]]]:
+    """Collect unvalidated candidates for every rule in a single pass over the text"""
+    found = {rule: [] for rule in CANDIDATE_RULES}
+    for m in CANDIDATE_TOKEN.finditer(text):
+        s, e = m.span()
+        word = m.group("word")
+        if word is not None:
+            word = word.upper()
+            if IN_IFSC.fullmatch(word):
+                found["IN_IFSC"].append((word, s, e))
+            elif IBAN_RE.fullmatch(word) and IBAN_SPAN.match(text, s):
+                found["IBAN"].append((word, s, e))
+            continue
+
+        run = m.group("run")
+        if not run.isdecimal():
+            found["ACCOUNT"].extend((dm.group(0), *dm.span()) for dm in DIGIT_WORD.finditer(text, s, e))
+            # Separators present: re-match each rule inside this run only
+            for rule, pattern in RUN_PATTERNS:
+                for rm in pattern.finditer(text, s, e):
+                    ms, me = rm.span()
+                    if rule == "CREDIT_CARD" and me == e:
+                        me = card_span_end(text, e)
+                    found[rule].append((text[ms:me], ms, me))
+            continue
+
+        # A bare digit word can only ever match as a whole, so its length decides
+        found["ACCOUNT"].append((run, s, e))
+        n = len(run)
+        if n == 9:
+            found["US_ROUTING"].append((run, s, e))
+        if 12 <= n <= 19:
+            ce = card_span_end(text, e)
+            found["CREDIT_CARD"].append((text[s:ce], s, ce))
+        if n == 6:
+            found["UK_SORT"].append((run, s, e))
+            found["AU_BSB"].append((run, s, e))
+        if n == 5:
+            found["CA_TRANSIT"].append((run, s, e))
+        if n >= 8:
+            found["NUM_NEAR"].append((run, s, e))
+    return found
+
+def digits_between(words: list[tuple[str, int, int]], shortest: int, longest: int) -> list[tuple[str, int, int]]:
+    return [w for w in words if shortest <= len(w[0]) <= longest]
+
+def proximity_pairs(anchors: list[tuple[str, int, int]], partners: list[tuple[str, int, int]], radius: int):
+    """Yield (anchor, partners lying wholly within radius chars of it).
+
+    Both lists are sorted and non-overlapping, so each anchor's window is a
+    contiguous slice of partners found with a two-pointer sweep in linear
+    time. A partner overlapping the anchor itself does not count.
+    """
+    lo = hi = 0
+    n = len(partners)
+    for anchor in anchors:
+        _, a_s, a_e = anchor
+        while lo < n and partners[lo][1] < a_s - radius:
+            lo += 1
+        hi = max(hi, lo)
+        while hi < n and partners[hi][2] <= a_e + radius:
+            hi += 1
+        yield anchor, [p for p in partners[lo:hi] if p[2] <= a_s or p[1] >= a_e]
+
+def scan_text(path: str, text: str, in_code=None):
+    """(kind, raw, start, end) findings in text; in_code as for ContextIndex"""
     findings = []
+    candidates = find_candidates(text)
 
     # A) IBANs (validate)
-    for m in IBAN_RE.finditer(text.upper()):
-        val = m.group(0)
-        if iban_checksum_ok(val):
-            findings.append(("IBAN", val, m.start(), m.end()))
+    ibans = candidates["IBAN"]
+    for (val, s, e), ok in zip(ibans, iban_checksum_ok_batch([c[0] for c in ibans])):
+        if ok:
+            findings.append(("IBAN", val, s, e))
 
     # B) ABA routing (validate)
-    for m in re.finditer(r"\b\d{9}\b", text):
-        rt = m.group(0)
-        if aba_ok(rt):
-            findings.append(("US_ROUTING", rt, m.start(), m.end()))
+    routings = candidates["US_ROUTING"]
+    for (rt, s, e), ok in zip(routings, aba_ok_batch([c[0] for c in routings])):
+        if ok:
+            findings.append(("US_ROUTING", rt, s, e))
 
     # C) Credit cards (Luhn + length + brand sanity)
-    for m in CC_SPAN.finditer(text):
-        raw = m.group(0)
-        num = normalize_number(raw)
-        if 12 <= len(num) <= 19 and luhn_ok(num):
+    cards = [(raw, s, e, num) for raw, s, e in candidates["CREDIT_CARD"]
+             if 12 <= len(num := normalize_number(raw)) <= 19]
+    for (raw, s, e, _), ok in zip(cards, luhn_ok_batch([c[3] for c in cards])):
+        if ok:
             # mild false-positive cut: must not be inside an IBAN
-            findings.append(("CREDIT_CARD", raw, m.start(), m.end()))
+            findings.append(("CREDIT_CARD", raw, s, e))
 
-    # D) Country proximity rules (format + nearby pairing or context)
+    # D) Country proximity rules (format + every nearby account)
+    accounts = candidates["ACCOUNT"]
     # UK: sort + 8-digit account within 60 chars
-    for sm in UK_SORT.finditer(text):
-        s_range = (sm.start(), sm.end())
-        window = text[max(0, s_range[0] - 60): s_range[1] + 60]
-        am = UK_ACCT.search(window)
-        if am:
-            findings.append(("UK_SORT", sm.group(0), sm.start(), sm.end()))
-            findings.append(("ACCOUNT_LIKE", am.group(0),
-                             max(0, s_range[0]-60) + am.start(),
-                             max(0, s_range[0]-60) + am.end()))
+    for (sort_code, s, e), near in proximity_pairs(candidates["UK_SORT"], digits_between(accounts, *UK_ACCT), 60):
+        if near:
+            findings.append(("UK_SORT", sort_code, s, e))
+            findings.extend(("ACCOUNT_LIKE", *acct) for acct in near)
     # AU: BSB + 6-10 digit account within 60 chars
-    for bm in AU_BSB.finditer(text):
-        b_range = (bm.start(), bm.end())
-        window = text[max(0, b_range[0]-60): b_range[1]+60]
-        am = AU_ACCT.search(window)
-        if am:
-            findings.append(("AU_BSB", bm.group(0), bm.start(), bm.end()))
-            findings.append(("ACCOUNT_LIKE",
-                             am.group(0),
-                             max(0, b_range[0]-60) + am.start(),
-                             max(0, b_range[0]-60) + am.end()))
+    for (bsb, s, e), near in proximity_pairs(candidates["AU_BSB"], digits_between(accounts, *AU_ACCT), 60):
+        if near:
+            findings.append(("AU_BSB", bsb, s, e))
+            findings.extend(("ACCOUNT_LIKE", *acct) for acct in near)
     # CA: transit + institution + account roughly nearby
-    for tm in CA_TRANSIT.finditer(text):
-        t_range = (tm.start(), tm.end())
-        win = text[max(0, t_range[0]-80): t_range[1]+80]
-        im = CA_INST.search(win)
-        am = CA_ACCT.search(win)
-        if im and am:
-            findings.append(("CA_TRANSIT", tm.group(0), tm.start(), tm.end()))
-            findings.append(("CA_INST",
-                             im.group(0),
-                             max(0, t_range[0]-80) + im.start(),
-                             max(0, t_range[0]-80) + im.end()))
-            findings.append(("ACCOUNT_LIKE",
-                             am.group(0),
-                             max(0, t_range[0]-80) + am.start(),
-                             max(0, t_range[0]-80) + am.end()))
+    transits = candidates["CA_TRANSIT"]
+    for ((transit, s, e), insts), (_, near) in zip(
+            proximity_pairs(transits, digits_between(accounts, *CA_INST), 80),
+            proximity_pairs(transits, digits_between(accounts, *CA_ACCT), 80)):
+        if insts and near:
+            findings.append(("CA_TRANSIT", transit, s, e))
+            findings.extend(("CA_INST", *inst) for inst in insts)
+            findings.extend(("ACCOUNT_LIKE", *acct) for acct in near)
     # IN: IFSC + account within 60 chars
-    for im in IN_IFSC.finditer(text.upper()):
-        i_range = (im.start(), im.end())
-        win = text[max(0, i_range[0]-60): i_range[1]+60]
-        am = IN_ACCT.search(win)
-        if am:
-            findings.append(("IN_IFSC", im.group(0), im.start(), im.end()))
-            findings.append(("ACCOUNT_LIKE",
-                             am.group(0),
-                             max(0, i_range[0]-60) + am.start(),
-                             max(0, i_range[0]-60) + am.end()))
+    for (ifsc, s, e), near in proximity_pairs(candidates["IN_IFSC"], digits_between(accounts, *IN_ACCT), 60):
+        if near:
+            findings.append(("IN_IFSC", ifsc, s, e))
+            findings.extend(("ACCOUNT_LIKE", *acct) for acct in near)
 
     # E) Generic context-based catch
-    for m in NUM_NEAR.finditer(text):
-        s, e = m.span()
+    for raw, s, e in candidates["NUM_NEAR"]:
         if CONTEXT.search(text[max(0, s-60): e+60]):
-            findings.append(("ACCOUNT_LIKE", m.group(0), s, e))
+            findings.append(("ACCOUNT_LIKE", raw, s, e))
 
     # Filter out false positives and deduplicate
+    if not findings:
+        return []
+    index = ContextIndex(text, in_code)
     seen = set()
     uniq = []
     for kind, raw, s, e in findings:
-        # Get context around the finding for false positive detection
-        context = snippet(text, s, e, 80)
-
         # Skip if likely false positive
-        if is_likely_false_positive(raw, context):
+        if is_likely_false_positive(raw, s, e, index):
             continue
 
         k = (kind, raw, s, e)
@@ -262,6 +518,117 @@ def scan_text(path: str, text: str):
             seen.add(k)
     return uniq
 
+def finding_row(path: str, kind: str, raw: str, start: int, end: int, line: int, context: str) -> dict:
+    return {
+        "file": path,
+        "line": line,
+        "start": start,
+        "end": end,
+        "type": kind,
+        "value_masked": mask_value(kind, raw),
+        "value_raw": raw,
+        "context": context,
+    }
+
+def finding_rows(path: str, text: str):
+    """Yield one output row per finding, shared by every output format"""
+    offsets = None
+    for kind, raw, s, e in scan_text(path, text):
+        if offsets is None:
+            offsets = line_offsets(text)
+        yield finding_row(path, kind, raw, s, e, line_number(offsets, s), snippet(text, s, e))
+
+# ---------- Streaming (mmap) scanning ----------
+# Large files are decoded and scanned STREAM_CHUNK bytes at a time. Each scan
+# window keeps STREAM_MARGIN characters on both sides of the span it reports
+# for, which covers the widest look-around of any rule: an anchor plus its
+# 80-character proximity window and account, a 19-digit card with
+# separators, and the 80-character safe-context radius. Code spans are not
+# local (a closing fence can be megabytes from its opening one), so they are
+# indexed over the whole mapped file first and looked up by byte offset.
+# Only numeric spans longer than the margin (e.g. endless digit tables) can
+# be split.
+STREAM_CHUNK = 1 << 20
+STREAM_MARGIN = 256
+
+class _ByteOffsets:
+    """Character offset -> encoded byte offset within one text
+
+    Identity for ASCII (and latin-1). Otherwise the encoded length of every
+    BLOCK characters is summed once, on first use, so a lookup encodes at
+    most one partial block instead of the whole prefix.
+    """
+
+    BLOCK = 1024
+
+    def __init__(self, text: str, encoding: str):
+        self.text = text
+        self.encoding = encoding
+        self.identity = text.isascii() or encoding == "latin-1"
+        self.prefix = None
+
+    def __call__(self, pos: int) -> int:
+        if self.identity:
+            return pos
+        text, block = self.text, self.BLOCK
+        if self.prefix is None:
+            total = 0
+            self.prefix = [0]
+            for i in range(0, len(text), block):
+                total += len(text[i:i + block].encode(self.encoding))
+                self.prefix.append(total)
+        i = pos // block
+        return self.prefix[i] + len(text[i * block:pos].encode(self.encoding))
+
+def _stream_rows(path: str, mm, encoding: str, code: tuple[list[int], list[int]]):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    buf = ""
+    to_byte = None  # _ByteOffsets of buf
+    base = 0        # file offset (characters) of buf[0]
+    base_byte = 0   # file offset (bytes) of buf[0]
+    base_line = 1   # line number of buf[0]
+    owned = 0       # findings starting before this offset were already reported
+
+    def in_code(start, end):
+        return _covers(code, base_byte + to_byte(start), base_byte + to_byte(end))
+
+    for pos in range(0, len(mm), STREAM_CHUNK):
+        final = pos + STREAM_CHUNK >= len(mm)
+        buf += decoder.decode(mm[pos:pos + STREAM_CHUNK], final)
+        to_byte = _ByteOffsets(buf, encoding)
+        # Hold back the last STREAM_MARGIN chars until the next chunk arrives
+        upto = base + len(buf) if final else base + len(buf) - STREAM_MARGIN
+        if upto <= owned:
+            continue
+        offsets = None
+        for kind, raw, s, e in scan_text(path, buf, in_code):
+            if owned <= base + s < upto:
+                if offsets is None:
+                    offsets = line_offsets(buf)
+                yield finding_row(path, kind, raw, base + s, base + e,
+                                  base_line + line_number(offsets, s) - 1, snippet(buf, s, e))
+        owned = upto
+
+        # Keep STREAM_MARGIN chars of left context before the next owned span
+        drop = max(0, upto - base - STREAM_MARGIN)
+        if 0 < drop < len(buf) and buf[drop - 1] == "\r" and buf[drop] == "\n":
+            drop -= 1  # never split a CRLF pair across the line count
+        base_line += sum(1 for _ in LINE_BREAK.finditer(buf, 0, drop))
+        base_byte += to_byte(drop)
+        buf = buf[drop:]
+        base += drop
+
+def stream_file_rows(path: str, mm) -> list[dict]:
+    """Scan a memory-mapped file chunk by chunk with bounded memory"""
+    if is_probably_binary(mm[:STREAM_CHUNK]) or not may_contain_findings(mm):
+        return []
+    code = code_spans(mm)
+    try:
+        return list(_stream_rows(path, mm, "utf-8", code))
+    except UnicodeDecodeError:
+        # Same fallback as decode_text: latin-1 maps every byte
+        return list(_stream_rows(path, mm, "latin-1", code))
+
 def walk_files(root: str, max_bytes: int, include_exts: set[str] | None, exclude_exts: set[str] | None):
     for dirpath, _, filenames in os.walk(root):
         for fn in filenames:
@@ -273,63 +640,586 @@ def walk_files(root: str, max_bytes: int, include_exts: set[str] | None, exclude
                 continue
             yield path
 
+# ---------- Incremental scan cache ----------
+def rules_version(*settings) -> str:
+    # Any edit to this script (patterns, validators, filters) or different
+    # read settings (--max-bytes, --stream) invalidate every cached result.
+    h = hashlib.sha256()
+    with open(os.path.abspath(__file__), "rb") as f:
+        h.update(f.read())
+    h.update(repr(settings).encode())
+    return h.hexdigest()
+
+def stream_file(path: str, known_sha256: str | None = None) -> dict | None:
+    """scan_file counterpart that maps the whole file instead of truncating it"""
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_size == 0:
+                digest, rows = hashlib.sha256().hexdigest(), []
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest = hashlib.sha256(mm).hexdigest()
+                    rows = None if digest == known_sha256 else stream_file_rows(path, mm)
+    except (OSError, ValueError):
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest, "rows": rows}
+
+def scan_file(path: str, max_bytes: int, known_sha256: str | None = None, stream: bool = False) -> dict | None:
+    """Read and scan one file, returning its cache entry (None if unreadable).
+
+    When the content hash equals known_sha256 the scan is skipped and "rows"
+    is None, meaning the caller's previous rows are still valid. With stream
+    the whole file is scanned through mmap and max_bytes is ignored.
+    """
+    if stream:
+        return stream_file(path, known_sha256)
+    try:
+        st = os.stat(path)
+        with open(path, "rb") as f:
+            data = f.read(max_bytes)
+    except Exception:
+        return None
+    digest = hashlib.sha256(data).hexdigest()
+    rows = None
+    if digest != known_sha256:
+        text = decode_candidate_text(data)
+        rows = [] if text is None else list(finding_rows(path, text))
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest, "rows": rows}
+
+class ScanCache:
+    """Per-file findings keyed by path, size, mtime and content hash.
+
+    With path None the cache lives in memory only (used by the daemon).
+    """
+
+    def __init__(self, path: str | None, version: str):
+        self.path = path
+        self.version = version
+        self.entries = {}
+        self.seen = set()
+        if path is None:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == version:
+                self.entries = data.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            pass  # Missing or unreadable cache: start empty
+
+    def fresh_rows(self, path: str) -> list[dict] | None:
+        """Cached rows if size and mtime are unchanged, without reading the file"""
+        self.seen.add(path)
+        entry = self.entries.get(path)
+        if not entry:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["rows"]
+        return None
+
+    def known_sha256(self, path: str) -> str | None:
+        entry = self.entries.get(path)
+        return entry["sha256"] if entry else None
+
+    def update(self, path: str, entry: dict) -> list[dict]:
+        # rows is None when the content hash matched: keep the cached rows
+        if entry["rows"] is None:
+            entry["rows"] = self.entries[path]["rows"]
+        self.entries[path] = entry
+        return entry["rows"]
+
+    def save(self):
+        # Drop files that were not visited this run, then replace atomically.
+        # The cache holds raw findings, so keep it private to the user.
+        files = {p: e for p, e in self.entries.items() if p in self.seen}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp.{os.getpid()}"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "files": files}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+# ---------- Parallel scanning ----------
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def iter_file_rows(paths: list[str], max_bytes: int, jobs: int, cache: ScanCache | None = None,
+                   stream: bool = False):
+    """Yield (path, rows) for each path, in the same order as paths.
+
+    Files still fresh in the cache are not read. The rest are scanned in-process,
+    or spread over a pool of jobs processes with the largest files submitted
+    first so one big file does not end up running alone at the tail. Results
+    are yielded as soon as the next file in order is done, and closing the
+    generator early cancels the work that has not started yet.
+    """
+    cached = {}
+    pending = []
+    for path in paths:
+        rows = cache.fresh_rows(path) if cache is not None else None
+        if rows is None:
+            pending.append(path)
+        else:
+            cached[path] = rows
+
+    def known(path):
+        return cache.known_sha256(path) if cache is not None else None
+
+    pool = None
+    futures = {}
+    if jobs > 1 and len(pending) > 1:
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(pending)))
+        for path in sorted(pending, key=_file_size, reverse=True):
+            futures[path] = pool.submit(scan_file, path, max_bytes, known(path), stream)
+
+    try:
+        for path in paths:
+            if path in cached:
+                yield path, cached[path]
+                continue
+            if pool is not None:
+                entry = futures[path].result()
+            else:
+                entry = scan_file(path, max_bytes, known(path), stream)
+            if entry is None:
+                yield path, []
+            elif cache is not None:
+                yield path, cache.update(path, entry)
+            else:
+                yield path, entry["rows"]
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+def scan_files(paths: list[str], max_bytes: int, jobs: int, cache: ScanCache | None = None,
+               stream: bool = False) -> list[dict]:
+    """Scan paths, returning all rows in the same order as paths"""
+    rows = []
+    for _, file_rows in iter_file_rows(paths, max_bytes, jobs, cache, stream):
+        rows.extend(file_rows)
+    return rows
+
+# ---------- Git diff-only scanning ----------
+# Only lines added relative to a revision are reported. Each run of added
+# lines is scanned with STREAM_MARGIN characters of surrounding text so the
+# proximity rules and false-positive context still see their neighbours.
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+class GitError(Exception):
+    pass
+
+def _git(cwd: str, *args: str) -> bytes:
+    try:
+        proc = subprocess.run(["git", "-c", "core.quotepath=off", *args], cwd=cwd, capture_output=True)
+    except OSError as e:
+        raise GitError(f"git not available: {e}") from e
+    if proc.returncode != 0:
+        raise GitError(proc.stderr.decode("utf-8", "replace").strip())
+    return proc.stdout
+
+def git_added_lines(root: str, rev: str | None = None, staged: bool = False) -> tuple[str, dict[str, list[tuple[int, int]]]]:
+    """Repository top level and, per changed file under root, its added line ranges.
+
+    Ranges are 1-based and end-exclusive. Uses plumbing only: diff-index
+    compares rev (default HEAD) with the index (staged) or the work tree.
+    In work-tree mode untracked files (minus ignored ones) count as wholly
+    added.
+    """
+    top = _git(root, "rev-parse", "--show-toplevel").decode().strip()
+    if rev is None:
+        try:
+            _git(top, "rev-parse", "--verify", "--quiet", "HEAD^{commit}")
+            rev = "HEAD"
+        except GitError:
+            rev = EMPTY_TREE  # No commits yet: everything is added
+    pathspec = os.path.relpath(os.path.abspath(root), top)
+    args = ["diff-index", "--no-color", "--no-ext-diff", "--no-renames", "--diff-filter=ACMR"]
+    if staged:
+        args.append("--cached")
+    args.append(rev)
+
+    # Exact paths come from the NUL-separated name list; the patch, which
+    # lists the same files in the same order, only supplies the hunks (its
+    # "+++ b/path" lines are quoted or tab-terminated for unusual names)
+    names = [os.fsdecode(n) for n in _git(top, *args, "-z", "--name-only", "--", pathspec).split(b"\0") if n]
+    out = _git(top, *args, "-p", "-U0", "--", pathspec).decode("utf-8", "replace")
+
+    added = {}
+    file_index = -1
+    for line in out.splitlines():
+        if line.startswith("diff --git "):
+            file_index += 1
+        elif line.startswith("@@"):
+            m = HUNK_HEADER.match(line)
+            if m and 0 <= file_index < len(names):
+                start, count = int(m.group(1)), int(m.group(2) or 1)
+                if count:
+                    added.setdefault(names[file_index], []).append((start, start + count))
+
+    if not staged:
+        untracked = _git(top, "ls-files", "-z", "--others", "--exclude-standard", "--", pathspec)
+        for name in untracked.split(b"\0"):
+            if name:
+                added[os.fsdecode(name)] = [(1, sys.maxsize)]
+    return top, added
+
+def scan_added_lines(path: str, text: str, ranges: list[tuple[int, int]], margin: int = STREAM_MARGIN) -> list[dict]:
+    """Rows for findings that overlap the given added line ranges of text
+
+    Each window is scanned on its own, but code spans come from the whole
+    text, so fences pair exactly as in a full scan.
+    """
+    offsets = line_offsets(text)
+
+    def offset_of(line):
+        return offsets[line - 1] if line - 1 < len(offsets) else len(text)
+
+    # Group added spans whose context windows touch, scan each group once
+    groups = []
+    for a, b in sorted(ranges):
+        span = (offset_of(a), offset_of(b))
+        if groups and span[0] - groups[-1][-1][1] <= 2 * margin:
+            groups[-1].append(span)
+        else:
+            groups.append([span])
+
+    rows = []
+    code = code_spans(text) if groups else None
+    for spans in groups:
+        # Widen to whole lines so no digit run is cut at a window edge
+        ws = offsets[line_number(offsets, max(0, spans[0][0] - margin)) - 1]
+        we = min(len(text), spans[-1][1] + margin)
+        if we < len(text):
+            we = offset_of(line_number(offsets, we) + 1)
+        in_code = lambda s, e, ws=ws: _covers(code, ws + s, ws + e)
+        for kind, raw, s, e in scan_text(path, text[ws:we], in_code):
+            s, e = ws + s, ws + e
+            if any(s < b and e > a for a, b in spans):
+                rows.append(finding_row(path, kind, raw, s, e, line_number(offsets, s), snippet(text, s, e)))
+    return rows
+
+def iter_git_rows(root: str, rev: str | None, staged: bool, max_bytes: int,
+                  include_exts: set[str] | None, exclude_exts: set[str] | None):
+    """Yield (path, rows) for files changed under root, scanning only added lines.
+
+    With staged the index content is scanned (what is about to be committed),
+    otherwise the work tree.
+    """
+    top, added = git_added_lines(root, rev, staged)
+    for rel, ranges in sorted(added.items()):
+        ext = os.path.splitext(rel)[1].lower()
+        if include_exts and ext not in include_exts:
+            continue
+        if exclude_exts and ext in exclude_exts:
+            continue
+        path = os.path.join(top, rel)
+        try:
+            if staged:
+                data = _git(top, "cat-file", "blob", f":{rel}")[:max_bytes]
+            else:
+                with open(path, "rb") as f:
+                    data = f.read(max_bytes)
+        except (OSError, GitError) as e:
+            print(f"⚠️  Could not read {rel}, not scanned: {e}", file=sys.stderr)
+            continue
+        text = decode_candidate_text(data)
+        yield path, [] if text is None else scan_added_lines(path, text, ranges)
+
+# ---------- Library API ----------
+# Defaults tuned for the emergency plan's markdown content
+DEFAULT_INCLUDE_EXTS = {'.md', '.txt', '.yml', '.yaml'}
+DEFAULT_EXCLUDE_EXTS = {'.git', '.pdf', '.png', '.jpg', '.jpeg'}
+
+def iter_paths(roots, max_bytes: int, include_exts: set[str] | None, exclude_exts: set[str] | None):
+    # Directories are walked with walk_files; files are taken as given
+    for root in roots:
+        root = os.path.abspath(root)
+        if os.path.isfile(root):
+            yield root
+        else:
+            yield from walk_files(root, max_bytes, include_exts, exclude_exts)
+
+def scan_paths(*roots: str, max_bytes: int = 5_000_000,
+               include_exts: set[str] | None = DEFAULT_INCLUDE_EXTS,
+               exclude_exts: set[str] | None = DEFAULT_EXCLUDE_EXTS,
+               jobs: int = 1, cache: ScanCache | None = None, stream: bool = False):
+    """Yield a finding row for every finding in the given files and directories.
+
+    Rows are the same dicts the CLI prints. Directories are filtered by
+    extension; files named directly are always scanned.
+    """
+    paths = list(iter_paths(roots, max_bytes, include_exts, exclude_exts))
+    results = iter_file_rows(paths, max_bytes, jobs, cache, stream)
+    try:
+        for _, file_rows in results:
+            yield from file_rows
+    finally:
+        results.close()
+
+def has_findings(*roots: str, **options) -> bool:
+    """True as soon as any file under roots has a finding; the rest is not scanned"""
+    for _ in scan_paths(*roots, **options):
+        return True
+    return False
+
+# ---------- Scan daemon ----------
+# `--serve --socket PATH` keeps the compiled rules and an in-memory result
+# cache warm. The protocol is JSON Lines over a Unix socket: the client sends
+# one request, the daemon answers {"file": path, "rows": [...]} per file and a
+# final {"done": true}, or {"error": msg}. Clients that find no daemon, or a
+# daemon started from a different version of this script, scan in-process.
+class DaemonError(Exception):
+    pass
+
+class ScanRequestHandler(socketserver.StreamRequestHandler):
+    def send(self, obj: dict):
+        self.wfile.write(json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return  # A liveness probe (see serve) connects and hangs up
+        try:
+            request = json.loads(line)
+            if request.get("op") != "scan":
+                raise ValueError(f"unknown op {request.get('op')!r}")
+        except (ValueError, AttributeError) as e:
+            self.send({"error": f"bad request: {e}"})
+            return
+        if request.get("version") != self.server.version:
+            self.send({"error": "daemon runs a different scanner version", "stale": True})
+            return
+        results = self.server.results(request)
+        try:
+            for path, rows in results:
+                self.send({"file": path, "rows": rows})
+            self.send({"done": True})
+        except GitError as e:
+            self.send({"error": str(e), "git": True})
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client stopped reading (e.g. --quiet --exit-code hit)
+        finally:
+            results.close()
+
+class ScanDaemon(socketserver.UnixStreamServer):
+    """Serves scans one at a time from a long-lived process"""
+
+    def __init__(self, socket_path: str, jobs: int = 1):
+        self.version = rules_version()
+        self.jobs = jobs
+        self.caches = {}  # (max_bytes, stream) -> in-memory ScanCache
+        super().__init__(socket_path, ScanRequestHandler)
+
+    def results(self, request: dict):
+        root = os.path.abspath(request["root"])
+        max_bytes = int(request.get("max_bytes", 5_000_000))
+        stream = bool(request.get("stream"))
+        include_exts = set(request["include_exts"]) if request.get("include_exts") else None
+        exclude_exts = set(request["exclude_exts"]) if request.get("exclude_exts") else None
+        if request.get("since") or request.get("staged"):
+            return iter_git_rows(root, request.get("since"), bool(request.get("staged")),
+                                 max_bytes, include_exts, exclude_exts)
+        key = (max_bytes, stream)
+        if key not in self.caches:
+            self.caches[key] = ScanCache(None, self.version)
+        paths = list(walk_files(root, max_bytes, include_exts, exclude_exts))
+        return iter_file_rows(paths, max_bytes, self.jobs, self.caches[key], stream)
+
+def _connect(socket_path: str) -> socket.socket | None:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+def serve(socket_path: str, jobs: int = 1):
+    """Run the scan daemon on socket_path until interrupted"""
+    probe = _connect(socket_path)
+    if probe is not None:
+        probe.close()
+        raise DaemonError(f"a daemon is already listening on {socket_path}")
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # Left over from a daemon that did not exit cleanly
+
+    # Findings include raw values: only the owner may connect
+    umask = os.umask(0o077)
+    try:
+        server = ScanDaemon(socket_path, jobs)
+    finally:
+        os.umask(umask)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"🔌 Generic scan daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+
+def _daemon_results(sock: socket.socket, reader, first: dict):
+    try:
+        reply = first
+        while True:
+            if "error" in reply:
+                raise (GitError if reply.get("git") else DaemonError)(reply["error"])
+            if reply.get("done"):
+                return
+            yield reply["file"], reply["rows"]
+            line = reader.readline()
+            if not line:
+                raise DaemonError("connection closed before the scan finished")
+            reply = json.loads(line)
+    finally:
+        reader.close()
+        sock.close()
+
+def request_daemon_scan(socket_path: str, root: str, **options):
+    """Iterator of (path, rows) from a running daemon, or None to scan in-process.
+
+    options are the ScanDaemon.results request fields: max_bytes, stream,
+    include_exts, exclude_exts, since and staged.
+    """
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+    request = {"op": "scan", "version": rules_version(), "root": os.path.abspath(root)}
+    for key, value in options.items():
+        request[key] = sorted(value) if isinstance(value, set) else value
+    reader = sock.makefile("rb")
+    try:
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        first = json.loads(reader.readline() or b"{}")
+    except (OSError, ValueError):
+        first = {}
+    if not first or first.get("stale"):
+        reader.close()
+        sock.close()
+        return None
+    return _daemon_results(sock, reader, first)
+
 def main():
     p = argparse.ArgumentParser(description="Scan directory for credit cards and bank details (IBAN/ABA/context).")
-    p.add_argument("directory", help="Root directory to scan")
+    p.add_argument("directory", nargs="?", help="Root directory to scan")
     p.add_argument("--json", action="store_true", help="Output JSON instead of CSV")
+    p.add_argument("--jsonl", action="store_true", help="Stream one JSON object per finding as each file is scanned, then a summary object")
     p.add_argument("--max-bytes", type=int, default=5_000_000, help="Max bytes to read per file (default 5MB)")
     p.add_argument("--include-ext", action="append", help="Limit to these file extensions (repeatable), e.g. --include-ext .txt --include-ext .log")
     p.add_argument("--exclude-ext", action="append", help="Exclude these file extensions (repeatable)")
     p.add_argument("--exit-code", action="store_true", help="Exit with code 1 if secrets found, 0 if clean (for CI integration)")
     p.add_argument("--quiet", action="store_true", help="Suppress output, just set exit code")
+    p.add_argument("--cache", metavar="PATH", help="Reuse results for unchanged files from this cache file (created if missing)")
+    p.add_argument("--stream", action="store_true", help="Scan whole files in memory-mapped chunks instead of stopping at --max-bytes")
+    p.add_argument("--jobs", type=int, default=1, metavar="N", help="Scan files in N worker processes (0 = one per CPU, default 1)")
+    p.add_argument("--since", metavar="REV", help="Only scan lines added since this git revision (work tree vs REV, untracked files in full)")
+    p.add_argument("--staged", action="store_true", help="Only scan lines added in the git index (vs --since REV, default HEAD), e.g. for pre-commit")
+    p.add_argument("--socket", metavar="PATH", help="Use the scan daemon on this Unix socket if one is running (falls back to scanning in-process)")
+    p.add_argument("--serve", action="store_true", help="Run as a long-lived scan daemon on --socket instead of scanning")
     args = p.parse_args()
 
+    if args.serve:
+        if not args.socket:
+            p.error("--serve requires --socket")
+        try:
+            serve(args.socket, args.jobs if args.jobs > 0 else (os.cpu_count() or 1))
+        except (DaemonError, OSError) as e:
+            print(f"❌ Could not start scan daemon: {e}", file=sys.stderr)
+            sys.exit(2)
+        return
+    if args.directory is None:
+        p.error("the directory argument is required")
+
     # Default to markdown files for emergency plan project
-    include_exts = set(e.lower() for e in args.include_ext) if args.include_ext else {'.md', '.txt', '.yml', '.yaml'}
-    exclude_exts = set(e.lower() for e in args.exclude_ext) if args.exclude_ext else {'.git', '.pdf', '.png', '.jpg', '.jpeg'}
+    include_exts = set(e.lower() for e in args.include_ext) if args.include_ext else DEFAULT_INCLUDE_EXTS
+    exclude_exts = set(e.lower() for e in args.exclude_ext) if args.exclude_ext else DEFAULT_EXCLUDE_EXTS
 
     root = os.path.abspath(args.directory)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    git_mode = args.since or args.staged
+
+    # JSON needs the full list; CSV and JSON Lines are written file by file
     rows = []
-    for path in walk_files(root, args.max_bytes, include_exts, exclude_exts):
-        text = read_text_file(path, args.max_bytes)
-        if text is None:
-            continue
-        for kind, raw, s, e in scan_text(path, text):
-            # find line number
-            line_no = 1
-            line_start = 0
-            for ln, line, off in iter_lines_with_offsets(text):
-                if s < off + len(line):
-                    line_no = ln
-                    line_start = off
-                    break
-            value_masked = mask_value(kind, raw)
-            rows.append({
-                "file": path,
-                "line": line_no,
-                "start": s,
-                "end": e,
-                "type": kind,
-                "value_masked": value_masked,
-                "value_raw": raw,
-                "context": snippet(text, s, e),
-            })
+    found = 0
+    files = 0
+    writer = None
+    if not args.quiet and not args.json and not args.jsonl:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["file","line","start","end","type","value_masked","value_raw","context"])
+
+    cache = None
+    results = None
+    if args.socket:
+        results = request_daemon_scan(args.socket, root, max_bytes=args.max_bytes, stream=args.stream,
+                                      include_exts=include_exts, exclude_exts=exclude_exts,
+                                      since=args.since, staged=args.staged)
+    if results is not None:
+        pass  # The daemon keeps its own cache
+    elif git_mode:
+        results = iter_git_rows(root, args.since, args.staged, args.max_bytes, include_exts, exclude_exts)
+    else:
+        if args.cache:
+            cache = ScanCache(args.cache, rules_version(args.max_bytes, args.stream))
+        paths = list(walk_files(root, args.max_bytes, include_exts, exclude_exts))
+        results = iter_file_rows(paths, args.max_bytes, jobs, cache, args.stream)
+    try:
+        for path, file_rows in results:
+            files += 1
+            found += len(file_rows)
+            if args.quiet:
+                if found and args.exit_code:
+                    break  # Only the exit code matters: stop at the first hit
+                continue
+            if args.json:
+                rows.extend(file_rows)
+                continue
+            for r in file_rows:
+                if args.jsonl:
+                    print(json.dumps(r, ensure_ascii=False))
+                else:
+                    writer.writerow([r["file"], r["line"], r["start"], r["end"], r["type"], r["value_masked"], r["value_raw"], r["context"]])
+            sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader stopped early (e.g. `| head`); stop scanning quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        args.quiet = True
+    except GitError as e:
+        print(f"❌ git diff failed: {e}", file=sys.stderr)
+        sys.exit(2)
+    except DaemonError as e:
+        print(f"❌ Scan daemon failed: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        results.close()
+
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"⚠️  Could not write scan cache {args.cache}: {e}", file=sys.stderr)
 
     # Output results
     if not args.quiet:
         if args.json:
             print(json.dumps(rows, indent=2, ensure_ascii=False))
-        else:
-            w = csv.writer(sys.stdout)
-            w.writerow(["file","line","start","end","type","value_masked","value_raw","context"])
-            for r in rows:
-                w.writerow([r["file"], r["line"], r["start"], r["end"], r["type"], r["value_masked"], r["value_raw"], r["context"]])
+        elif args.jsonl:
+            print(json.dumps({"summary": {"files": files, "findings": found}}))
 
     # Exit with appropriate code for CI integration
     if args.exit_code:
-        sys.exit(1 if rows else 0)
-    elif rows and not args.quiet:
-        print(f"\n⚠️  Found {len(rows)} potential sensitive data items", file=sys.stderr)
+        sys.exit(1 if found else 0)
+    elif found and not args.quiet:
+        print(f"\n⚠️  Found {found} potential sensitive data items", file=sys.stderr)
 
 if __name__ == "__main__":
     main()